@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 from app.api.routes.system import router as system_router
 from app.api.routes.detection import router as detection_router
+from app.api.routes.jobs import router as jobs_router
+from app.api.routes.models import router as models_router
 
 api_router = APIRouter(prefix="/v1")
 
 api_router.include_router(system_router)
-api_router.include_router(detection_router)
\ No newline at end of file
+api_router.include_router(detection_router)
+api_router.include_router(jobs_router)
+api_router.include_router(models_router)
\ No newline at end of file
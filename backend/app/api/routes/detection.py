@@ -1,36 +1,68 @@
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 import cv2
+import hashlib
 from pathlib import Path
+from typing import Optional, Tuple
+from uuid import uuid4
 
 from app.core.config import (
-    ALLOWED_EXTENSIONS, ALLOWED_VIDEO_EXTENSIONS, ALLOWED_IMAGE_EXTENSIONS, 
-    TEMP_DIR, PREDICTION_DIR, CONF_THRESHOLD
+    ALLOWED_EXTENSIONS, ALLOWED_VIDEO_EXTENSIONS,
+    TEMP_DIR, BASE_DIR, CHUNK_SIZE, MAX_IMAGE_UPLOAD_SIZE, MAX_VIDEO_UPLOAD_SIZE
 )
-from app.utils.file_utils import is_valid_file, is_video_file, is_image_file, cleanup_runs_directory, safe_remove_file
-from app.services.detector import get_detector
-from app.services.video_processor import process_video_frame_by_frame, convert_avi_to_mp4, stream_video_file
-from app.services.sentence_generator import generate_sentence_from_detections
+from app.utils.file_utils import is_valid_file, is_video_file, get_file_extension, safe_remove_file
+from app.utils.response_utils import build_file_response
+from app.services.job_queue import Job, JobStatus, QueueFullError, get_job_manager
+from app.services.model_registry import ModelVariant, get_model_registry
+from app.services.result_cache import ResultCache, get_result_cache
+from app.services.video_processor import process_video_frame_by_frame
+from app.services.sentence_generator import generate_sentence_from_detections, generate_sentence_from_segments
+from app.services.temporal_aggregator import SignSequenceAggregator
 
 router = APIRouter(tags=["Detection"])
 
 class DetectionHandler:
-    def __init__(self):
-        self.detector = get_detector()
+    def resolve_model(self, model: Optional[str]) -> ModelVariant:
+        try:
+            return get_model_registry().variant(model)
+        except KeyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.args[0]
+            )
     
-    async def save_upload_file(self, file: UploadFile) -> Path:
-        temp_file = TEMP_DIR / f"temp_{file.filename}"
+    async def save_upload_file(self, file: UploadFile, max_size: int) -> Tuple[Path, str]:
+        if file.size is not None and file.size > max_size:
+            raise self._file_too_large(max_size)
+        
+        temp_file = TEMP_DIR / f"{uuid4().hex}{get_file_extension(file.filename)}"
+        digest = hashlib.sha256()
+        size = 0
         try:
-            contents = await file.read()
             with open(temp_file, "wb") as f:
-                f.write(contents)
-            return temp_file
+                while chunk := await file.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise self._file_too_large(max_size)
+                    digest.update(chunk)
+                    await run_in_threadpool(f.write, chunk)
+            return temp_file, digest.hexdigest()
+        except HTTPException:
+            safe_remove_file(temp_file)
+            raise
         except Exception as e:
+            safe_remove_file(temp_file)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
                 detail=f"Could not save file: {str(e)}"
             )
     
+    def _file_too_large(self, max_size: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is too large. Maximum size is {max_size // (1024 * 1024)} MB"
+        )
+    
     def validate_file(self, filename: str):
         if not filename:
             raise HTTPException(
@@ -44,41 +76,89 @@ class DetectionHandler:
                 detail=f"Unsupported file format. Allowed formats: {', '.join(ALLOWED_EXTENSIONS)}"
             )
     
-    async def process_video(self, temp_path: Path, filename: str):
-        self._validate_video_file(temp_path)
+    async def submit_job(self, file: UploadFile, model: Optional[str] = None) -> Job:
+        self.validate_file(file.filename)
+        variant = self.resolve_model(model)
+        
+        kind = "video" if is_video_file(file.filename, ALLOWED_VIDEO_EXTENSIONS) else "image"
+        max_size = MAX_VIDEO_UPLOAD_SIZE if kind == "video" else MAX_IMAGE_UPLOAD_SIZE
+        temp_path, content_hash = await self.save_upload_file(file, max_size)
+        job = Job(kind, file.filename, temp_path, model=variant.name)
+        job.cache_key = ResultCache.make_key(content_hash, kind, variant.path, variant.conf_threshold, variant.input_size)
+        
+        cached = get_result_cache().get(job.cache_key)
+        if cached is not None:
+            result, output_path = cached
+            if kind == "video":
+                result["video_path"] = self._video_path(output_path)
+            return get_job_manager().complete(job, result, output_path)
+        
+        try:
+            return get_job_manager().submit(job, self.process_job)
+        except QueueFullError as e:
+            safe_remove_file(temp_path)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+    
+    def process_job(self, job: Job) -> dict:
+        result = self.process_video(job) if job.kind == "video" else self.process_image(job)
+        if job.cache_key is not None:
+            get_result_cache().put(job.cache_key, result, job.output_path)
+        return result
+    
+    def process_video(self, job: Job):
+        self._validate_video_file(job.input_path)
         
-        frame_detections, fps = process_video_frame_by_frame(temp_path)
-        self.detector.model.predict(source=temp_path, save=True, conf=CONF_THRESHOLD, verbose=False, max_det=1)
+        output_path = job.output_dir / f"{Path(job.filename).stem}.mp4"
+        aggregator = SignSequenceAggregator()
+        frame_detections, fps = process_video_frame_by_frame(
+            job.input_path, output_path=output_path, progress_callback=job.update_progress, aggregator=aggregator, model=job.model
+        )
         
-        video_path = await self._handle_video_conversion()
-        sentence = generate_sentence_from_detections(frame_detections)
+        job.output_path = output_path if output_path.exists() else None
+        video_path = self._video_path(job.output_path)
+        sentence = generate_sentence_from_segments(aggregator.segments)
         
         return {
             "detections": frame_detections,
+            "segments": [segment.to_dict() for segment in aggregator.segments],
             "video_path": video_path,
             "type": "video",
+            "model": job.model,
             "fps": fps,
+            "inferred_frames": sum(1 for frame in frame_detections if frame["inferred"]),
             "sentence": sentence
         }
     
-    def process_image(self, temp_path: Path):
-        image = cv2.imread(str(temp_path))
+    def process_image(self, job: Job):
+        image = cv2.imread(str(job.input_path))
         if image is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, 
                 detail="Failed to read image, it may be corrupted"
             )
         
-        detections, _ = self.detector.detect_from_image(image, input_size=640)
-        self.detector.model.predict(source=image, save=True, conf=CONF_THRESHOLD, verbose=False, max_det=1)
+        variant = get_model_registry().variant(job.model)
+        detector = get_model_registry().get_detector(variant.name)
+        detections = detector.detect_batch([image], batch_size=1, input_size=variant.input_size, conf_threshold=variant.conf_threshold)[0]
+        
+        job.output_path = job.output_dir / f"{Path(job.filename).stem}.jpg"
+        cv2.imwrite(str(job.output_path), detector._draw_detections(image, detections))
+        job.update_progress(1, 1)
         
         sentence = generate_sentence_from_detections(detections)
         return {
             "detections": detections,
             "type": "image",
+            "model": job.model,
             "sentence": sentence
         }
     
+    def _video_path(self, output_path: Optional[Path]) -> Optional[str]:
+        return output_path.resolve().relative_to(BASE_DIR).as_posix() if output_path else None
+    
     def _validate_video_file(self, temp_path: Path):
         cap = cv2.VideoCapture(str(temp_path))
         if not cap.isOpened():
@@ -95,82 +175,49 @@ class DetectionHandler:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to read video frames"
             )
-    
-    async def _handle_video_conversion(self):
-        avi_files = list(PREDICTION_DIR.glob("*.avi"))
-        if avi_files:
-            avi_path = avi_files[0]
-            mp4_path = avi_path.with_suffix('.mp4')
-            await convert_avi_to_mp4(avi_path, mp4_path)
-            
-            if mp4_path.exists():
-                safe_remove_file(avi_path)
-                return f"runs/detect/predict/{mp4_path.name}"
-        
-        mp4_files = list(PREDICTION_DIR.glob("*.mp4"))
-        if mp4_files:
-            return f"runs/detect/predict/{mp4_files[0].name}"
-        
-        print("Warning: No video files found in prediction directory")
-        return None
 
 
 handler = DetectionHandler()
 
 
-@router.post("/detections")
-async def predict_objects(file: UploadFile = File(...)):
-    handler.validate_file(file.filename)
-    cleanup_runs_directory()
-    
-    temp_path = await handler.save_upload_file(file)
-    
-    try:
-        if is_video_file(file.filename, ALLOWED_VIDEO_EXTENSIONS):
-            return await handler.process_video(temp_path, file.filename)
-        elif is_image_file(file.filename, ALLOWED_IMAGE_EXTENSIONS):
-            return handler.process_image(temp_path)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during processing: {str(e)}"
-        )
-    finally:
-        safe_remove_file(temp_path)
-
-
-@router.get("/detections/result")
-async def get_prediction_result():
-    if not PREDICTION_DIR.exists():
+def serve_job_result(request: Request, job: Optional[Job]):
+    if job is None or job.status != JobStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="No predictions available"
         )
     
-    files = list(PREDICTION_DIR.glob("*"))
-    if not files:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail="No prediction files found"
-        )
-    
-    file_path = files[0]
-    if not file_path.exists():
+    file_path = job.output_path
+    if file_path is None or not file_path.exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prediction file not found"
         )
     
-    extension = Path(file_path.name).suffix.lower()
-    if extension in ALLOWED_VIDEO_EXTENSIONS:
-        return StreamingResponse(
-            content=stream_video_file(file_path),
-            media_type="video/mp4",
-            headers={"Content-Disposition": f"inline; filename={file_path.name}"}
-        )
-    else:
-        return FileResponse(
-            path=file_path, 
-            media_type="image/jpeg",
-            headers={"Content-Disposition": f"inline; filename={file_path.name}"}
+    return build_file_response(request, file_path)
+
+
+@router.post("/detections")
+async def predict_objects(file: UploadFile = File(...), model: Optional[str] = None):
+    job = await handler.submit_job(file, model)
+    await get_job_manager().wait(job)
+    
+    if job.status == JobStatus.FAILED:
+        if isinstance(job.exception, HTTPException):
+            raise job.exception
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred during processing: {job.error}"
         )
+    
+    return {**job.result, "job_id": job.id, "result_url": job.result_url}
+
+
+@router.get("/detections/result")
+async def get_prediction_result(request: Request):
+    return serve_job_result(request, get_job_manager().latest_completed())
+
+
+@router.get("/detections/result/{job_id}")
+async def get_prediction_result_by_id(job_id: str, request: Request):
+    return serve_job_result(request, get_job_manager().get(job_id))
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from typing import Optional
+
+from app.api.routes.detection import handler
+from app.services.job_queue import get_job_manager
+
+router = APIRouter(tags=["Jobs"])
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(file: UploadFile = File(...), model: Optional[str] = None):
+    """
+    Queue an image or video for detection without waiting for the result
+    
+    Returns:
+        Dictionary with the job id and the URL to poll for its status
+    """
+    job = await handler.submit_job(file, model)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/v1/jobs/{job.id}"
+    }
+
+
+@router.get("/jobs")
+def get_job_queue_stats():
+    """
+    Get the state of the job worker pool
+    
+    Returns:
+        Dictionary with worker count and queued/running job counts
+    """
+    return get_job_manager().get_stats()
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Get the status, progress and (once completed) result of a job
+    
+    Returns:
+        Dictionary describing the job
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job.to_dict()
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.services.model_registry import get_model_registry
+
+router = APIRouter(tags=["Models"])
+
+
+@router.get("/models")
+def list_models():
+    """
+    Get the configured model variants and the sessions currently loaded
+    
+    Returns:
+        Dictionary with variants, loaded sessions, reload and eviction counters
+    """
+    return get_model_registry().get_stats()
+
+
+@router.post("/models/{name}/reload")
+async def reload_model(name: str):
+    """
+    Reload a model variant from disk and swap it in once it is warmed up
+    
+    Returns:
+        Dictionary describing the newly loaded session
+    """
+    registry = get_model_registry()
+    try:
+        registry.variant(name)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.args[0]
+        )
+    
+    try:
+        return await run_in_threadpool(registry.reload, name)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reload model {name}: {e}"
+        )
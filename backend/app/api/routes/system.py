@@ -1,4 +1,13 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.config import INFERENCE_WORKERS
+from app.services.inference_scheduler import get_inference_schedulers
+from app.services.inference_workers import get_inference_worker_pool
+from app.services.metrics import get_metrics
+from app.services.model_warmup import get_model_warmup
+from app.services.paraphrase_cache import get_paraphrase_cache
+from app.services.result_cache import get_result_cache
 
 router = APIRouter(tags=["System"])
 
@@ -14,3 +23,66 @@ def get_system_status():
         "status": "online", 
         "message": "VSL Detection Backend running"
     }
+
+@router.get("/status/ready")
+def get_readiness():
+    """
+    Get whether every model is loaded and warmed up
+    
+    Returns:
+        Model states and warm-up latencies, with status 503 until all models are ready
+    """
+    warmup = get_model_warmup()
+    return JSONResponse(warmup.get_status(), status_code=200 if warmup.is_ready() else 503)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """
+    Get per-stage latency histograms, counters and queue gauges
+    
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/status/scheduler")
+def get_scheduler_stats():
+    """
+    Get batching statistics of the real-time inference schedulers
+    
+    Returns:
+        Dictionary with batch size and queue wait statistics per model variant
+    """
+    return {name: scheduler.get_stats() for name, scheduler in get_inference_schedulers().items()}
+
+@router.get("/status/workers")
+def get_worker_stats():
+    """
+    Get health of the out-of-process inference workers
+    
+    Returns:
+        Dictionary with per-worker liveness, restarts, in-flight requests and ping latency
+    """
+    if INFERENCE_WORKERS <= 0:
+        return {"workers": []}
+    return get_inference_worker_pool().get_stats()
+
+@router.get("/status/paraphrase-cache")
+def get_paraphrase_cache_stats():
+    """
+    Get hit/miss statistics of the paraphrase cache
+    
+    Returns:
+        Dictionary with cache counters and sizes
+    """
+    return get_paraphrase_cache().get_stats()
+
+@router.get("/status/result-cache")
+def get_result_cache_stats():
+    """
+    Get hit/miss statistics and disk usage of the upload result cache
+    
+    Returns:
+        Dictionary with cache counters and sizes
+    """
+    return get_result_cache().get_stats()
@@ -1,12 +1,25 @@
 from fastapi import WebSocket, WebSocketDisconnect
+import asyncio
 import json
 import cv2
 import numpy as np
 import base64
-from PIL import Image, ImageDraw, ImageFont
+from functools import partial
+from time import perf_counter
+from typing import List, Optional, Tuple
 
-from app.core.config import FONT_PATH, WEBSOCKET_CONF_THRESHOLD
-from app.services.detector import get_detector
+from app.core.config import CAPTION_PAUSE_SECONDS, MOTION_GATE_MAX_STRIDE, REALTIME_MODEL_VARIANT, ROI_TRACKING
+from app.services.inference_executor import get_inference_executor
+from app.services.inference_scheduler import get_inference_scheduler
+from app.services.metrics import get_metrics, time_stage
+from app.services.model_registry import get_model_registry
+from app.services.motion_gate import MotionGate
+from app.services.preprocessing import Letterboxer, LetterboxTransform
+from app.services.renderer import get_annotation_renderer
+from app.services.roi_tracker import RoiTracker
+from app.services.sentence_generator import generate_sentence_from_words
+from app.services.temporal_aggregator import SignSequenceAggregator
+from app.utils.frame_protocol import FrameProtocolError, decode_frame_message, encode_reply_message
 
 class WebSocketManager:
     def __init__(self):
@@ -20,162 +33,308 @@ class WebSocketManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
 
+connection_manager = WebSocketManager()
+get_metrics().register_gauge("vsl_websocket_connections", lambda: len(connection_manager.active_connections))
+
+class LatestFrameMailbox:
+    """
+    One-slot mailbox holding the most recent frame of a connection.
+
+    Putting a frame while the previous one is still waiting replaces it, so a
+    client that sends faster than inference can keep up gets fresh results
+    instead of an ever-growing backlog.
+    """
+
+    def __init__(self):
+        self.dropped_frames = 0
+        self._item = None
+        self._ready = asyncio.Event()
+
+    def put(self, item):
+        if self._item is not None:
+            self.dropped_frames += 1
+            get_metrics().increment("vsl_stream_frames_total", result="dropped")
+        self._item = item
+        self._ready.set()
+
+    async def get(self):
+        await self._ready.wait()
+        item, self._item = self._item, None
+        self._ready.clear()
+        return item
+
+class LiveCaptioner:
+    """
+    Per-connection live captions built from the stream of frame detections.
+
+    Every finished word is pushed right away as a caption_partial message.
+    Once signing pauses for pause_seconds, the buffered words are paraphrased
+    off the event loop and pushed as a caption_final message. Captions are
+    only sent to connections that ask for them with the captions setting.
+    """
+
+    def __init__(self, websocket: WebSocket, send_lock: asyncio.Lock, pause_seconds: float = CAPTION_PAUSE_SECONDS):
+        self.websocket = websocket
+        self.send_lock = send_lock
+        self.pause_seconds = pause_seconds
+        self.aggregator = SignSequenceAggregator()
+        self.words = []
+        self._frame_number = 0
+        self._last_activity = perf_counter()
+        self._finalizer = None
+
+    async def push(self, detections: List[dict]):
+        now = perf_counter()
+        segments = self.aggregator.push(self._frame_number, now, detections)
+        self._frame_number += 1
+
+        if not segments and self.aggregator.active_word is None:
+            return
+
+        self._last_activity = now
+        if self._finalizer is None or self._finalizer.done():
+            self._finalizer = asyncio.create_task(self._finalize_after_pause())
+            self._finalizer.add_done_callback(self._log_finalizer_error)
+
+        if segments:
+            self.words.extend(segment.word for segment in segments)
+            await self.send({"type": "caption_partial", "words": list(self.words), "text": " ".join(self.words)})
+
+    async def send(self, message: dict):
+        async with self.send_lock:
+            await self.websocket.send_json(message)
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer.cancel()
+
+    @staticmethod
+    def _log_finalizer_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error finalizing caption: {task.exception()}")
+
+    async def _finalize_after_pause(self):
+        while True:
+            remaining = self._last_activity + self.pause_seconds - perf_counter()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+
+        self.words.extend(segment.word for segment in self.aggregator.flush())
+        words, self.words = self.words, []
+        if not words:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(None, generate_sentence_from_words, words)
+        except Exception as e:
+            print(f"Error generating caption: {e}")
+            text = " ".join(words)
+
+        await self.send({"type": "caption_final", "words": words, "text": text})
+
 class RealtimeDetectionHandler:
     def __init__(self):
-        self.detector = get_detector()
-        self.frame_count = 0
-        self.skip_frames = 0
-        self.resize_factor = 1.0
-        self.input_size = 320
+        self.motion_gate = MotionGate()
+        self.last_detections = []
+        self.model_name = REALTIME_MODEL_VARIANT
+        self.captions = False
+        self.letterboxer: Optional[Letterboxer] = None
+        self.inference_transform: Optional[LetterboxTransform] = None
+        self.roi_tracker = self._create_roi_tracker() if ROI_TRACKING else None
     
     def update_settings(self, data_json: dict):
+        if "model" in data_json and data_json["model"] != self.model_name:
+            try:
+                self.model_name = get_model_registry().variant(data_json["model"]).name
+            except KeyError as e:
+                raise ValueError(e.args[0])
+            self.letterboxer = None
+            if self.roi_tracker is not None:
+                self.roi_tracker = self._create_roi_tracker()
+        if "roi_tracking" in data_json and bool(data_json["roi_tracking"]) != (self.roi_tracker is not None):
+            self.roi_tracker = self._create_roi_tracker() if data_json["roi_tracking"] else None
+        if "captions" in data_json:
+            self.captions = bool(data_json["captions"])
         if "skip_frames" in data_json:
-            self.skip_frames = int(data_json["skip_frames"])
-        if "resize_factor" in data_json:
-            self.resize_factor = float(data_json["resize_factor"])
-    
-    def should_skip_frame(self) -> bool:
-        self.frame_count += 1
-        return self.skip_frames > 0 and self.frame_count % (self.skip_frames + 1) != 0
-    
-    def decode_frame(self, image_data: str) -> np.ndarray:
-        img_data = base64.b64decode(image_data.split(",")[1])
-        img_array = np.frombuffer(img_data, dtype=np.uint8)
-        frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+            skip_frames = int(data_json["skip_frames"])
+            self.motion_gate.max_stride = skip_frames + 1 if skip_frames > 0 else MOTION_GATE_MAX_STRIDE
+    
+    def should_skip_frame(self, frame: np.ndarray) -> bool:
+        return not self.motion_gate.should_infer(frame)
+    
+    def prepare_frame(self, data_json: dict) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], bool]:
+        self.update_settings(data_json)
         
-        if frame is not None and self.resize_factor != 1.0:
-            h, w = frame.shape[:2]
-            new_h, new_w = int(h * self.resize_factor), int(w * self.resize_factor)
-            frame = cv2.resize(frame, (new_w, new_h))
+        frame = self.decode_frame(data_json["image"])
+        if frame is None:
+            return None, None, False
         
-        return frame
-    
-    def detect_and_process(self, frame: np.ndarray, return_image: bool = False, timestamp=None) -> dict:
-        results = self.detector.model.predict(
-            source=frame, 
-            conf=WEBSOCKET_CONF_THRESHOLD, 
-            verbose=False,
-            imgsz=self.input_size,
-            max_det=1
-        )
-
-        detections = []
-        if results and results[0].boxes:
-            for box in results[0].boxes:
-                class_id = int(box.cls[0])
-                class_name = self.detector.model.names[class_id]
-                confidence = float(box.conf[0])
-                
-                if confidence >= WEBSOCKET_CONF_THRESHOLD:
-                    coords = box.xyxy[0].tolist()
-                    
-                    if self.resize_factor != 1.0:
-                        coords = [c / self.resize_factor for c in coords]
-                        
-                    detections.append({
-                        "class_name": class_name,
-                        "confidence": confidence,
-                        "bbox": coords
-                    })
+        inference_frame = self.letterbox_for_inference(frame)
+        return frame, inference_frame, self.should_skip_frame(inference_frame)
+    
+    async def detect(self, frame: np.ndarray, inference_frame: np.ndarray) -> List[dict]:
+        scheduler = get_inference_scheduler(self.model_name)
+        transform = self.inference_transform
+        tracker = self.roi_tracker
+        if tracker is None:
+            return transform.map_detections(await asyncio.wrap_future(scheduler.submit(inference_frame)))
         
+        detections = None
+        region = tracker.plan(frame.shape)
+        if region is not None:
+            crop_detections = await asyncio.wrap_future(scheduler.submit(tracker.crop(frame, region), tracker.input_size))
+            detections = tracker.track(crop_detections, region)
+        if detections is None:
+            detections = transform.map_detections(await asyncio.wrap_future(scheduler.submit(inference_frame)))
+        tracker.observe(detections)
+        return detections
+    
+    def skipped_response(self, timestamp=None) -> dict:
+        get_metrics().increment("vsl_stream_frames_total", result="skipped")
+        return {
+            "timestamp": timestamp,
+            "detections": self.last_detections,
+            "skipped": True,
+            "inferred_frames": self.motion_gate.frames_inferred
+        }
+    
+    def decode_frame(self, image_data) -> np.ndarray:
+        if isinstance(image_data, str):
+            image_data = base64.b64decode(image_data.split(",")[1])
+        img_array = np.frombuffer(image_data, dtype=np.uint8)
+        with time_stage("frame_decode"):
+            return cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+    
+    def letterbox_for_inference(self, frame: np.ndarray) -> np.ndarray:
+        if self.letterboxer is None:
+            self.letterboxer = self._create_letterboxer()
+        with time_stage("resize"):
+            inference_frame, self.inference_transform = self.letterboxer(frame)
+        return inference_frame
+    
+    def build_response(self, frame: np.ndarray, detections: List[dict], return_image: bool = False, timestamp=None) -> dict:
+        self.last_detections = detections
+        get_metrics().increment("vsl_stream_frames_total", result="inferred")
         response = {
             "timestamp": timestamp,
-            "detections": detections
+            "detections": detections,
+            "inferred_frames": self.motion_gate.frames_inferred
         }
         
         if return_image:
             annotated_frame = self._add_annotations(frame, detections)
-            _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            img_str = base64.b64encode(buffer).decode('utf-8')
-            response["image"] = f"data:image/jpeg;base64,{img_str}"
+            with time_stage("jpeg_encode"):
+                _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+            response["image"] = buffer.tobytes()
         
         return response
     
     def _add_annotations(self, frame: np.ndarray, detections: list) -> np.ndarray:
-        if self.resize_factor != 1.0:
-            h, w = frame.shape[:2]
-            frame = cv2.resize(frame, (int(w / self.resize_factor), int(h / self.resize_factor)))
-        
-        for det in detections:
-            x1, y1, x2, y2 = map(int, det["bbox"])
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            label = f"{det['class_name']}: {det['confidence']:.2f}"
-            
-            if FONT_PATH.exists():
-                frame = self._draw_text_with_font(frame, label, (x1, y1))
-        
-        return frame
+        return get_annotation_renderer().draw(frame, detections)
+    
+    def _create_letterboxer(self) -> Letterboxer:
+        registry = get_model_registry()
+        return Letterboxer(registry.get_detector(self.model_name).resolve_input_size(registry.variant(self.model_name).input_size))
+    
+    def _create_roi_tracker(self) -> RoiTracker:
+        return RoiTracker(get_model_registry().variant(self.model_name).input_size)
+
+async def send_response(websocket: WebSocket, response: dict, binary: bool):
+    image = response.pop("image", None)
+    
+    if binary:
+        await websocket.send_bytes(encode_reply_message(response, image))
+        return
+    
+    if image is not None:
+        img_str = base64.b64encode(image).decode('utf-8')
+        response["image"] = f"data:image/jpeg;base64,{img_str}"
+    await websocket.send_json(response)
+
+async def receive_message(websocket: WebSocket) -> dict:
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    return message
+
+def parse_frame_message(message: dict):
+    if message.get("bytes") is not None:
+        return decode_frame_message(message["bytes"]), True
+    return json.loads(message.get("text") or ""), False
+
+async def process_message(handler: RealtimeDetectionHandler, data_json: dict) -> dict:
+    loop = asyncio.get_running_loop()
+    executor = get_inference_executor()
+    timestamp = data_json.get("timestamp", None)
+    
+    frame, inference_frame, skip = await loop.run_in_executor(executor, handler.prepare_frame, data_json)
+    if frame is None:
+        return {"error": "Invalid image data"}
+    if skip:
+        return handler.skipped_response(timestamp)
+    
+    detections = await handler.detect(frame, inference_frame)
     
-    def _draw_text_with_font(self, frame: np.ndarray, text: str, position: tuple) -> np.ndarray:
+    return await loop.run_in_executor(
+        executor,
+        partial(handler.build_response, frame, detections, data_json.get("return_image", False), timestamp)
+    )
+
+async def process_frames(websocket: WebSocket, handler: RealtimeDetectionHandler, mailbox: LatestFrameMailbox, captioner: LiveCaptioner):
+    while True:
+        data_json, binary = await mailbox.get()
+        
         try:
-            x1, y1 = position
-            pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            draw = ImageDraw.Draw(pil_img)
-            
-            font_size = 16
-            font = ImageFont.truetype(str(FONT_PATH), font_size)
-            text_width, text_height = draw.textbbox((0, 0), text, font=font)[2:]
-            
-            draw.rectangle(
-                [(x1, y1 - text_height - 4), (x1 + text_width, y1)], 
-                fill=(0, 255, 0)
-            )
-            draw.text((x1, y1 - text_height - 2), text, font=font, fill=(0, 0, 0))
-            
-            return cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+            response = await process_message(handler, data_json)
         except Exception as e:
-            print(f"Error using PIL for text: {e}")
-            return frame
+            response = {"error": f"Processing error: {str(e)}"}
+        
+        if "error" in response:
+            await captioner.send(response)
+            continue
+        
+        detections = response["detections"]
+        response["dropped_frames"] = mailbox.dropped_frames
+        async with captioner.send_lock:
+            await send_response(websocket, response, binary)
+        
+        if handler.captions:
+            await captioner.push(detections)
 
 async def handle_websocket_detection(websocket: WebSocket):
-    manager = WebSocketManager()
     handler = RealtimeDetectionHandler()
+    mailbox = LatestFrameMailbox()
+    captioner = LiveCaptioner(websocket, asyncio.Lock())
     
-    await manager.connect(websocket)
+    await connection_manager.connect(websocket)
+    processor = asyncio.create_task(process_frames(websocket, handler, mailbox, captioner))
     
     try:
         while True:
-            data = await websocket.receive_text()
+            message = await receive_message(websocket)
+            
+            if processor.done():
+                break
             
             try:
-                data_json = json.loads(data)
+                data_json, binary = parse_frame_message(message)
                 if "image" not in data_json:
-                    await websocket.send_json({"error": "No image data received"})
-                    continue
-                
-                handler.update_settings(data_json)
-                
-                if handler.should_skip_frame():
-                    await websocket.send_json({
-                        "timestamp": data_json.get("timestamp", None),
-                        "detections": [],
-                        "skipped": True
-                    })
+                    await captioner.send({"error": "No image data received"})
                     continue
                 
-                frame = handler.decode_frame(data_json["image"])
-                if frame is None:
-                    await websocket.send_json({"error": "Invalid image data"})
-                    continue
-                
-                response = handler.detect_and_process(
-                    frame, 
-                    return_image=data_json.get("return_image", False),
-                    timestamp=data_json.get("timestamp", None)
-                )
-                
-                await websocket.send_json(response)
+                mailbox.put((data_json, binary))
                 
             except json.JSONDecodeError:
                 try:
-                    await websocket.send_json({"error": "Invalid JSON data"})
-                except:
+                    await captioner.send({"error": "Invalid JSON data"})
+                except Exception:
                     break
-            except Exception as e:
+            except FrameProtocolError as e:
                 try:
-                    await websocket.send_json({"error": f"Processing error: {str(e)}"})
-                except:
-                    print(f"WebSocket connection closed during error handling: {str(e)}")
+                    await captioner.send({"error": str(e)})
+                except Exception:
                     break
                 
     except WebSocketDisconnect:
@@ -183,4 +342,6 @@ async def handle_websocket_detection(websocket: WebSocket):
     except Exception as e:
         print(f"WebSocket error: {str(e)}")
     finally:
-        manager.disconnect(websocket)
+        processor.cancel()
+        captioner.close()
+        connection_manager.disconnect(websocket)
@@ -1,4 +1,5 @@
 from pathlib import Path
+import json
 import os
 
 ENV = os.getenv("ENV", "development")
@@ -8,8 +9,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 TEMP_DIR = BASE_DIR / "temp_files"
 FONT_DIR = BASE_DIR / "fonts"
 FONT_PATH = FONT_DIR / "arial.ttf"
-PREDICTION_DIR = Path("runs/detect/predict") or Path("runs/detect/predict2")
+LABEL_FONT_SIZE = 16
+LABEL_SPRITE_CACHE_SIZE = 1024
+JOBS_DIR = BASE_DIR / "runs" / "jobs"
 MODELS_DIR = BASE_DIR / "models"
+CACHE_DIR = BASE_DIR / "cache"
 
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
 ALLOWED_VIDEO_EXTENSIONS = {".mp4", ".mov"}
@@ -17,7 +21,65 @@ ALLOWED_EXTENSIONS = ALLOWED_IMAGE_EXTENSIONS.union(ALLOWED_VIDEO_EXTENSIONS)
 
 CONF_THRESHOLD = 0.76
 WEBSOCKET_CONF_THRESHOLD = 0.7
+WEBSOCKET_INPUT_SIZE = 320
 CHUNK_SIZE = 1024 * 1024
+MAX_IMAGE_UPLOAD_SIZE = int(os.getenv("MAX_IMAGE_UPLOAD_SIZE", str(20 * 1024 * 1024)))
+MAX_VIDEO_UPLOAD_SIZE = int(os.getenv("MAX_VIDEO_UPLOAD_SIZE", str(500 * 1024 * 1024)))
+# Whole request body, checked before multipart parsing; one extra chunk leaves room for the form framing
+MAX_UPLOAD_BODY_SIZE = max(MAX_IMAGE_UPLOAD_SIZE, MAX_VIDEO_UPLOAD_SIZE) + CHUNK_SIZE
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_QUEUE_DEPTH = int(os.getenv("JOB_MAX_QUEUE_DEPTH", "16"))
+JOB_MAX_RETAINED = 100
+
+RESULT_CACHE_DIR = CACHE_DIR / "results"
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+RESULT_CACHE_CONTROL = "private, max-age=3600"
+
+MAX_VIDEO_FRAMES = 1000
+VIDEO_BATCH_SIZE = int(os.getenv("VIDEO_BATCH_SIZE", "8"))
+VIDEO_PIPELINE_QUEUE_SIZE = 32
+# Worker processes that each run a time range of a long video; 0 keeps videos in a single pipeline
+VIDEO_SEGMENT_WORKERS = int(os.getenv("VIDEO_SEGMENT_WORKERS", "0"))
+VIDEO_SEGMENT_MIN_FRAMES = int(os.getenv("VIDEO_SEGMENT_MIN_FRAMES", "150"))
+
+MOTION_GATE_THRESHOLD = float(os.getenv("MOTION_GATE_THRESHOLD", "3.0"))
+MOTION_GATE_MAX_STRIDE = int(os.getenv("MOTION_GATE_MAX_STRIDE", "5"))
+MOTION_GATE_SAMPLE_SIZE = 64
+
+# Detect-then-track: after a confident detection, infer on a padded crop around it at a smaller input size
+ROI_TRACKING = os.getenv("ROI_TRACKING", "0") == "1"
+ROI_PADDING = 0.5
+ROI_INPUT_SCALE = 0.5
+ROI_REFRESH_INTERVAL = int(os.getenv("ROI_REFRESH_INTERVAL", "10"))
+ROI_MIN_CONFIDENCE = 0.8
+# Browser-playable H.264 first, MPEG-4 Part 2 as a fallback for OpenCV builds without it
+VIDEO_FOURCC_CANDIDATES = ("avc1", "mp4v")
+
+SCHEDULER_MAX_BATCH_SIZE = int(os.getenv("SCHEDULER_MAX_BATCH_SIZE", "8"))
+SCHEDULER_MAX_WAIT_MS = float(os.getenv("SCHEDULER_MAX_WAIT_MS", "10"))
+INFERENCE_EXECUTOR_WORKERS = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+INFERENCE_WORKER_SLOTS = max(2 * SCHEDULER_MAX_BATCH_SIZE, 1)
+INFERENCE_WORKER_SLOT_BYTES = int(os.getenv("INFERENCE_WORKER_SLOT_BYTES", str(1280 * 720 * 3)))
+INFERENCE_WORKER_TIMEOUT = float(os.getenv("INFERENCE_WORKER_TIMEOUT", "30"))
+INFERENCE_WORKER_HEALTH_INTERVAL = 2.0
+INFERENCE_WORKER_MAX_MODELS = 2
+
+SIGN_WINDOW_SIZE = 5
+SIGN_ENTER_SCORE = 0.5
+SIGN_EXIT_SCORE = 0.2
+SIGN_MIN_DURATION = 0.2
+CAPTION_PAUSE_SECONDS = float(os.getenv("CAPTION_PAUSE_SECONDS", "1.0"))
+
+PARAPHRASE_QUANTIZE = os.getenv("PARAPHRASE_QUANTIZE", "0") == "1"
+PARAPHRASE_BATCH_SIZE = 16
+PARAPHRASE_CACHE_PATH = CACHE_DIR / "paraphrases.sqlite3"
+PARAPHRASE_CACHE_MEMORY_SIZE = 1024
+PARAPHRASE_CACHE_DISK_SIZE = 100_000
+PARAPHRASE_CACHE_TTL_SECONDS = float(os.getenv("PARAPHRASE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+PARAPHRASE_PREWARM_FILE = BASE_DIR / "paraphrase_prewarm.txt"
 
 CORS_ORIGINS = ["http://localhost:5173"]
 
@@ -26,8 +88,26 @@ APP_DESCRIPTION = "API for VSL Recognition System"
 APP_VERSION = "1.0.0"
 
 DEFAULT_MODEL_PATH = str(MODELS_DIR / "best.onnx")
+# "ultralytics" runs the model through YOLO, "onnxruntime" uses a bare InferenceSession
+DETECTOR_BACKEND = os.getenv("DETECTOR_BACKEND", "ultralytics")
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+ONNX_IOU_THRESHOLD = 0.7
+
+# Named model variants; MODEL_VARIANTS (JSON) adds or overrides entries, missing fields come from "default"
+MODEL_VARIANTS = {
+    "default": {"path": DEFAULT_MODEL_PATH, "backend": DETECTOR_BACKEND, "input_size": 640, "conf_threshold": CONF_THRESHOLD},
+    "realtime": {"path": DEFAULT_MODEL_PATH, "backend": DETECTOR_BACKEND, "input_size": WEBSOCKET_INPUT_SIZE, "conf_threshold": WEBSOCKET_CONF_THRESHOLD},
+}
+for _name, _spec in json.loads(os.getenv("MODEL_VARIANTS", "{}")).items():
+    MODEL_VARIANTS[_name] = {**MODEL_VARIANTS.get(_name, MODEL_VARIANTS["default"]), **_spec}
+DEFAULT_MODEL_VARIANT = os.getenv("DEFAULT_MODEL_VARIANT", "default")
+REALTIME_MODEL_VARIANT = os.getenv("REALTIME_MODEL_VARIANT", "realtime")
+MODEL_REGISTRY_MAX_BYTES = int(os.getenv("MODEL_REGISTRY_MAX_BYTES", str(1024 * 1024 * 1024)))
+MODEL_RELOAD_CHECK_SECONDS = 5.0
 
 TEMP_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 FONT_DIR.mkdir(exist_ok=True)
 
 def setup_fonts() -> None:
@@ -1,10 +1,16 @@
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.config import CORS_ORIGINS, APP_TITLE, APP_DESCRIPTION, APP_VERSION
+from app.core.config import CORS_ORIGINS, APP_TITLE, APP_DESCRIPTION, APP_VERSION, MAX_UPLOAD_BODY_SIZE
 from app.api.routes import api_router
 from app.api.routes.websocket import handle_websocket_detection
-from app.services.detector import initialize_detector
+from app.services.inference_executor import shutdown_inference_executor
+from app.services.inference_scheduler import shutdown_inference_scheduler
+from app.services.inference_workers import shutdown_inference_worker_pool
+from app.services.job_queue import shutdown_job_manager
+from app.services.model_warmup import get_model_warmup
+from app.services.video_segments import shutdown_video_segment_processor
+from app.utils.upload_limit import UploadSizeLimitMiddleware
 
 def create_application() -> FastAPI:
     app = FastAPI(
@@ -13,6 +19,7 @@ def create_application() -> FastAPI:
         version=APP_VERSION,
     )
     
+    app.add_middleware(UploadSizeLimitMiddleware, max_body_size=MAX_UPLOAD_BODY_SIZE)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=CORS_ORIGINS,
@@ -29,6 +36,13 @@ app = create_application()
 
 @app.on_event("startup")
 async def startup():
-    print("Initializing sign language detection model...")
-    initialize_detector()
-    print("Model initialization complete!")
+    print("Loading and warming up models in the background...")
+    get_model_warmup().start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    shutdown_job_manager()
+    shutdown_inference_scheduler()
+    shutdown_inference_worker_pool()
+    shutdown_video_segment_processor()
+    shutdown_inference_executor()
@@ -1,4 +1,18 @@
-from app.services.detector import get_detector, SignLanguageDetector
-from app.services.video_processor import process_video_frame_by_frame, convert_avi_to_mp4, stream_video_file
-from app.services.sentence_generator import generate_sentence_from_detections
-from app.services.paraphraser import get_paraphraser
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    "get_detector": "app.services.detector",
+    "SignLanguageDetector": "app.services.detector",
+    "process_video_frame_by_frame": "app.services.video_processor",
+    "generate_sentence_from_detections": "app.services.sentence_generator",
+    "get_paraphraser": "app.services.paraphraser",
+    "get_paraphrase_cache": "app.services.paraphrase_cache",
+    "get_model_registry": "app.services.model_registry",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
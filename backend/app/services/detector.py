@@ -1,23 +1,41 @@
 import cv2
-import torch
 import numpy as np
 import base64
+import threading
 from time import time
-from typing import Dict, List, Tuple, Optional
-from ultralytics import YOLO
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Optional
 
-from app.core.config import CONF_THRESHOLD, DEFAULT_MODEL_PATH
+from app.core.config import CONF_THRESHOLD, DETECTOR_BACKEND, MAX_VIDEO_FRAMES, ROI_TRACKING, VIDEO_BATCH_SIZE
+from app.services.metrics import get_metrics, time_stage
+from app.services.motion_gate import MotionGate
+from app.services.preprocessing import InputTensorPool
+from app.services.renderer import get_annotation_renderer
+from app.services.roi_tracker import RoiTracker
+from app.services.temporal_aggregator import SignSequenceAggregator
+from app.services.video_pipeline import VideoPipeline
 
 class SignLanguageDetector:
     def __init__(self, model_path: str, conf_threshold: float = CONF_THRESHOLD):
         self.model_path = model_path
         self.conf_threshold = conf_threshold
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.device = 'cpu'
+        self.names = {}
+        self.fixed_batch_size: Optional[int] = None
+        self.fixed_input_size: Optional[int] = None
         self.model = self._load_and_optimize_model()
+        self.predict_lock = threading.Lock()
+        self.input_pool = InputTensorPool()
         
-    def _load_and_optimize_model(self) -> YOLO:
+    def _load_and_optimize_model(self):
         try:
+            import torch
+            from ultralytics import YOLO
+            
+            self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
             model = YOLO(self.model_path)
+            self.names = model.names
+            self.fixed_batch_size, self.fixed_input_size = self._read_static_input_shape()
             print(f"Model loaded from: {self.model_path}")
             # model.export(format="onnx", imgz=320, dynamic=True, simplify=True)
             # onnx_model = YOLO("best.onnx")
@@ -33,33 +51,73 @@ class SignLanguageDetector:
             raise RuntimeError(f"Failed to load model from {self.model_path}: {e}")
     
     def detect_from_image(self, image: np.ndarray, input_size: int = 640) -> Tuple[List[Dict], np.ndarray]:
-        image_resized = self._ensure_frame_size(image, input_size)
         start_time = time()
-        
-        results = self.model.predict(
-            source=image_resized,
-            conf=self.conf_threshold,
-            verbose=False,
-            imgsz=input_size,
-            retina_masks=False,
-            max_det=1
-        )
-        
-        detections = self._extract_detections(results)
+        detections = self.detect(image, input_size=input_size)
         fps = 1 / (time() - start_time) if (time() - start_time) > 0 else 0
-        annotated_image = self._draw_detections(image, detections, fps)
+        annotated_image = self._draw_detections(image.copy(), detections, fps)
         
         return detections, annotated_image
     
-    def _extract_detections(self, results) -> List[Dict]:
+    def resolve_input_size(self, input_size: int) -> int:
+        return self.fixed_input_size or input_size
+    
+    def _read_static_input_shape(self) -> Tuple[Optional[int], Optional[int]]:
+        suffix = Path(self.model_path).suffix.lower()
+        if suffix in (".pt", ".yaml", ".yml"):
+            return None, None
+        if suffix == ".onnx":
+            import onnxruntime as ort
+            from app.services.onnx_detector import static_input_shape
+            
+            session = ort.InferenceSession(self.model_path, providers=["CPUExecutionProvider"])
+            return static_input_shape(session.get_inputs()[0].shape)
+        # Other exports (TensorRT, OpenVINO, ...) are static by default; run them one frame at a time
+        return 1, None
+    
+    def detect(self, image: np.ndarray, input_size: int = 640) -> List[Dict]:
+        return self.detect_batch([image], batch_size=1, input_size=input_size)[0]
+    
+    def detect_batch(self, frames: List[np.ndarray], batch_size: int = VIDEO_BATCH_SIZE, input_size: int = 640, conf_threshold: Optional[float] = None) -> List[List[Dict]]:
+        import torch
+        
+        batch_detections = []
+        batch_size = max(1, self.fixed_batch_size or batch_size)
+        input_size = self.resolve_input_size(input_size)
+        conf_threshold = self.conf_threshold if conf_threshold is None else conf_threshold
+        
+        for start in range(0, len(frames), batch_size):
+            batch = frames[start:start + batch_size]
+            
+            with self.predict_lock:
+                with time_stage("resize"):
+                    input_tensor, transforms = self.input_pool.fill(batch, input_size, pad_to=self.fixed_batch_size)
+                with time_stage("inference"):
+                    results = self.model.predict(
+                        source=torch.from_numpy(input_tensor),
+                        conf=conf_threshold,
+                        verbose=False,
+                        imgsz=input_size,
+                        retina_masks=False,
+                        max_det=1
+                    )
+            
+            with time_stage("postprocess"):
+                for transform, result in zip(transforms, results):
+                    detections = self._extract_detections([result], conf_threshold)
+                    batch_detections.append(transform.map_detections(detections))
+        
+        get_metrics().increment("vsl_inference_frames_total", len(frames))
+        return batch_detections
+    
+    def _extract_detections(self, results, conf_threshold: float) -> List[Dict]:
         detections = []
         if results and results[0].boxes:
             for box in results[0].boxes:
                 class_id = int(box.cls[0])
-                class_name = self.model.names[class_id]
+                class_name = self.names[class_id]
                 confidence = float(box.conf[0])
                 
-                if confidence >= self.conf_threshold:
+                if confidence >= conf_threshold:
                     coords = box.xyxy[0].tolist() if hasattr(box, 'xyxy') and len(box.xyxy) > 0 else None
                     detections.append({
                         "class_name": class_name,
@@ -68,63 +126,17 @@ class SignLanguageDetector:
                     })
         return detections
     
-    def _ensure_frame_size(self, frame: np.ndarray, target_size: int) -> np.ndarray:
-        if frame is None:
-            return None
-        
-        h, w = frame.shape[:2]
-        if h != target_size or w != target_size:
-            frame = cv2.resize(frame, (target_size, target_size))
-        return frame
-    
     def _draw_detections(self, image: np.ndarray, detections: List[Dict], fps: Optional[float] = None) -> np.ndarray:
-        annotated_image = image.copy()
-        
-        for det in detections:
-            if "bbox" not in det or det["bbox"] is None:
-                continue
-                
-            x1, y1, x2, y2 = map(int, det["bbox"])
-            
-            cv2.rectangle(annotated_image, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            label = f"{det['class_name']}: {det['confidence']:.2f}"
-            text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_DUPLEX, 0.6, 1)[0]
-            
-            cv2.rectangle(annotated_image, (x1, y1 - 20), (x1 + text_size[0], y1), (0, 255, 0), -1)
-            cv2.putText(annotated_image, label, (x1, y1 - 5), cv2.FONT_HERSHEY_DUPLEX, 0.6, (0, 0, 0), 1)
-        
-        if fps is not None:
-            cv2.putText(annotated_image, f'FPS: {int(fps)}', (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
-        return annotated_image
+        return get_annotation_renderer().draw(image, detections, fps)
     
-    def process_video_frames(self, video_path: str, max_frames: int = 1000) -> Tuple[List[Dict], float]:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise ValueError(f"Failed to open video file: {video_path}")
-        
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_detections = []
-        frame_number = 0
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret or frame_number >= max_frames:
-                break
-                
-            timestamp = frame_number / fps
-            detections, _ = self.detect_from_image(frame)
-            
-            frame_detections.append({
-                "frame_number": frame_number,
-                "timestamp": timestamp,
-                "detections": detections
-            })
-            
-            frame_number += 1
-        
-        cap.release()
-        return frame_detections, fps
+    def process_video_frames(self, video_path: str, max_frames: int = MAX_VIDEO_FRAMES, output_path: Optional[Path] = None,
+                             batch_size: int = VIDEO_BATCH_SIZE, progress_callback: Optional[Callable[[int, int], None]] = None,
+                             aggregator: Optional[SignSequenceAggregator] = None, input_size: int = 640,
+                             conf_threshold: Optional[float] = None, roi_tracking: bool = ROI_TRACKING) -> Tuple[List[Dict], float]:
+        pipeline = VideoPipeline(self, batch_size=batch_size, motion_gate=MotionGate(), aggregator=aggregator,
+                                 input_size=input_size, conf_threshold=conf_threshold,
+                                 roi_tracker=RoiTracker(input_size) if roi_tracking else None)
+        return pipeline.run(video_path, max_frames=max_frames, output_path=output_path, progress_callback=progress_callback)
     
     def process_frame_for_websocket(self, frame: np.ndarray, input_size: int = 320, return_image: bool = False) -> Dict:
         detections, annotated_image = self.detect_from_image(frame, input_size=input_size)
@@ -138,15 +150,17 @@ class SignLanguageDetector:
             
         return response
 
-_detector_instance = None
+def create_detector(model_path: str, backend: str = DETECTOR_BACKEND) -> SignLanguageDetector:
+    if backend == "onnxruntime":
+        from app.services.onnx_detector import OnnxSignLanguageDetector
+        return OnnxSignLanguageDetector(model_path)
+    if backend == "ultralytics":
+        return SignLanguageDetector(model_path)
+    raise ValueError(f"Unknown detector backend: {backend}")
 
-def get_detector() -> SignLanguageDetector:
-    global _detector_instance
-    if _detector_instance is None:
-        _detector_instance = SignLanguageDetector(DEFAULT_MODEL_PATH)
-    return _detector_instance
+def get_detector(model: Optional[str] = None) -> SignLanguageDetector:
+    from app.services.model_registry import get_model_registry
+    return get_model_registry().get_detector(model)
 
 def initialize_detector():
-    global _detector_instance
-    if _detector_instance is None:
-        _detector_instance = SignLanguageDetector(DEFAULT_MODEL_PATH)
+    get_detector()
@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import INFERENCE_EXECUTOR_WORKERS
+
+_executor_instance: Optional[ThreadPoolExecutor] = None
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = ThreadPoolExecutor(
+            max_workers=INFERENCE_EXECUTOR_WORKERS,
+            thread_name_prefix="inference"
+        )
+    return _executor_instance
+
+def shutdown_inference_executor():
+    global _executor_instance
+    if _executor_instance is not None:
+        _executor_instance.shutdown(wait=False, cancel_futures=True)
+        _executor_instance = None
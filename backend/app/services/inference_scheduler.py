@@ -0,0 +1,226 @@
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError
+from functools import partial
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import INFERENCE_WORKERS, REALTIME_MODEL_VARIANT, SCHEDULER_MAX_BATCH_SIZE, SCHEDULER_MAX_WAIT_MS
+from app.services.inference_workers import InferenceWorkerPool, get_inference_worker_pool
+from app.services.metrics import STAGE_DURATION, get_metrics
+from app.services.model_registry import get_model_registry
+
+
+class _PendingFrame:
+    __slots__ = ("frame", "input_size", "future", "enqueued_at")
+
+    def __init__(self, frame: np.ndarray, input_size: int):
+        self.frame = frame
+        self.input_size = input_size
+        self.future = Future()
+        self.enqueued_at = perf_counter()
+
+
+class InferenceScheduler:
+    """
+    Collects frames submitted by every live stream and runs them through the
+    detector in micro-batches.
+
+    A batch is dispatched as soon as it reaches max_batch_size or when the
+    oldest waiting frame has waited max_wait_ms, whichever comes first. Each
+    caller gets a Future resolved with the detections for its own frame;
+    frames whose Future was cancelled before dispatch are dropped.
+
+    With a worker pool, batches are handed to the worker processes without
+    waiting for the previous batch, so several batches run in parallel.
+
+    Without an explicit detector, each batch runs on the registry's current
+    session for model_name, so hot-reloaded models are picked up. Frames
+    submitted with a different input size (e.g. ROI crops) share the queue
+    but are run as their own sub-batch.
+    """
+
+    def __init__(self, detector=None, worker_pool: Optional[InferenceWorkerPool] = None, max_batch_size: int = SCHEDULER_MAX_BATCH_SIZE, max_wait_ms: float = SCHEDULER_MAX_WAIT_MS,
+                 input_size: Optional[int] = None, conf_threshold: Optional[float] = None, model_name: str = REALTIME_MODEL_VARIANT):
+        variant = get_model_registry().variant(model_name)
+        self.model_name = variant.name
+        self.model_key = variant.key
+        self.worker_pool = worker_pool
+        self.detector = detector
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.input_size = input_size or variant.input_size
+        self.conf_threshold = variant.conf_threshold if conf_threshold is None else conf_threshold
+
+        self._pending = queue.Queue()
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = {}
+        self._frames = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._worker = threading.Thread(target=self._run, name=f"inference-scheduler-{self.model_name}", daemon=True)
+        self._worker.start()
+        get_metrics().register_gauge("vsl_queue_depth", self._pending.qsize, queue=f"inference_scheduler_{self.model_name}")
+
+    def submit(self, frame: np.ndarray, input_size: Optional[int] = None) -> Future:
+        if self._stop_event.is_set():
+            raise RuntimeError("Inference scheduler is stopped")
+
+        pending = _PendingFrame(frame, input_size or self.input_size)
+        self._pending.put(pending)
+        return pending.future
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._worker.join(timeout=1)
+
+        while True:
+            try:
+                pending = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if pending.future.set_running_or_notify_cancel():
+                pending.future.set_exception(RuntimeError("Inference scheduler stopped"))
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            batches = sum(self._batch_sizes.values())
+            return {
+                "model": self.model_name,
+                "batches": batches,
+                "frames": self._frames,
+                "mean_batch_size": round(self._frames / batches, 3) if batches else 0.0,
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+                "mean_queue_wait_ms": round(1000 * self._queue_wait_total / self._frames, 3) if self._frames else 0.0,
+                "max_queue_wait_ms": round(1000 * self._queue_wait_max, 3),
+                "queue_depth": self._pending.qsize()
+            }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                print(f"Error dispatching inference batch: {e}")
+                self._fail(batch, e)
+
+    def _collect_batch(self) -> List[_PendingFrame]:
+        try:
+            first = self._pending.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - perf_counter()
+            try:
+                batch.append(self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self, batch: List[_PendingFrame]) -> None:
+        batch = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        dispatched_at = perf_counter()
+        self._record_batch(batch, dispatched_at)
+
+        groups: Dict[int, List[_PendingFrame]] = {}
+        for pending in batch:
+            groups.setdefault(pending.input_size, []).append(pending)
+        for input_size, group in groups.items():
+            self._dispatch_group(group, input_size)
+
+    def _dispatch_group(self, batch: List[_PendingFrame], input_size: int) -> None:
+        frames = [pending.frame for pending in batch]
+
+        if self.worker_pool is not None:
+            try:
+                future = self.worker_pool.submit_batch(frames, input_size=input_size, conf_threshold=self.conf_threshold, model=self.model_key)
+            except Exception as e:
+                self._fail(batch, e)
+                return
+            future.add_done_callback(partial(self._resolve, batch))
+            return
+
+        try:
+            detector = self.detector or get_model_registry().get_detector(self.model_name)
+            batch_detections = detector.detect_batch(
+                frames,
+                batch_size=len(batch),
+                input_size=input_size,
+                conf_threshold=self.conf_threshold
+            )
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        for pending, detections in zip(batch, batch_detections):
+            self._set_result(pending, detections)
+
+    def _resolve(self, batch: List[_PendingFrame], future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            self._fail(batch, error)
+            return
+        for pending, detections in zip(batch, future.result()):
+            self._set_result(pending, detections)
+
+    @classmethod
+    def _fail(cls, batch: List[_PendingFrame], error: BaseException) -> None:
+        for pending in batch:
+            cls._set_result(pending, error=error)
+
+    @staticmethod
+    def _set_result(pending: _PendingFrame, detections: Optional[List[Dict]] = None, error: Optional[BaseException] = None) -> None:
+        try:
+            if error is not None:
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(detections)
+        except InvalidStateError:
+            pass
+
+    def _record_batch(self, batch: List[_PendingFrame], dispatched_at: float) -> None:
+        waits = [dispatched_at - pending.enqueued_at for pending in batch]
+        histogram = get_metrics().histogram(STAGE_DURATION, stage="scheduler_queue_wait")
+        for wait in waits:
+            histogram.observe(wait)
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+            self._frames += len(batch)
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, max(waits))
+
+
+_scheduler_instances: Dict[str, InferenceScheduler] = {}
+_scheduler_lock = threading.Lock()
+
+def get_inference_scheduler(model: Optional[str] = None) -> InferenceScheduler:
+    model = get_model_registry().variant(model or REALTIME_MODEL_VARIANT).name
+    scheduler = _scheduler_instances.get(model)
+    if scheduler is None:
+        with _scheduler_lock:
+            scheduler = _scheduler_instances.get(model)
+            if scheduler is None:
+                worker_pool = get_inference_worker_pool() if INFERENCE_WORKERS > 0 else None
+                scheduler = _scheduler_instances[model] = InferenceScheduler(worker_pool=worker_pool, model_name=model)
+    return scheduler
+
+def get_inference_schedulers() -> Dict[str, InferenceScheduler]:
+    return dict(_scheduler_instances)
+
+def shutdown_inference_scheduler():
+    with _scheduler_lock:
+        schedulers = list(_scheduler_instances.values())
+        _scheduler_instances.clear()
+    for scheduler in schedulers:
+        scheduler.stop()
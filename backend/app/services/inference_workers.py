@@ -0,0 +1,314 @@
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    DEFAULT_MODEL_PATH, DETECTOR_BACKEND, INFERENCE_WORKERS, INFERENCE_WORKER_SLOTS, INFERENCE_WORKER_SLOT_BYTES,
+    INFERENCE_WORKER_TIMEOUT, INFERENCE_WORKER_HEALTH_INTERVAL, INFERENCE_WORKER_MAX_MODELS
+)
+from app.services.metrics import get_metrics
+
+
+def _frame_from_spec(buffer, slot_bytes: int, spec) -> np.ndarray:
+    if spec[0] == "array":
+        return spec[1]
+    _, slot, shape = spec
+    return np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=slot * slot_bytes)
+
+
+def _worker_main(shm_name: str, slot_bytes: int, model_path: str, backend: str, connection) -> None:
+    from app.services.model_registry import DetectorCache
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    models = DetectorCache(INFERENCE_WORKER_MAX_MODELS)
+    models.get(model_path, backend)
+
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                break
+            if message is None:
+                break
+
+            request_id, kind = message[0], message[1]
+            try:
+                if kind == "ping":
+                    result = os.getpid()
+                else:
+                    _, _, specs, (model_path, backend), input_size, conf_threshold = message
+                    detector = models.get(model_path, backend)
+                    frames = [_frame_from_spec(shm.buf, slot_bytes, spec) for spec in specs]
+                    result = detector.detect_batch(frames, batch_size=len(frames), input_size=input_size, conf_threshold=conf_threshold)
+                    del frames
+                connection.send((request_id, result, None))
+            except Exception as e:
+                connection.send((request_id, None, str(e)))
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+class _WorkerHandle:
+    def __init__(self, index: int, slots: int, slot_bytes: int):
+        self.index = index
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self.lock = threading.Condition()
+        self.send_lock = threading.Lock()
+        self.free_slots = deque(range(slots))
+        self.pending: Dict[int, tuple] = {}
+        self.process = None
+        self.connection = None
+        self.restarts = 0
+        self.ping_ms: Optional[float] = None
+
+    def acquire_slots(self, count: int) -> List[int]:
+        with self.lock:
+            while len(self.free_slots) < count:
+                self.lock.wait()
+            return [self.free_slots.popleft() for _ in range(count)]
+
+    def release_slots(self, slots: List[int]) -> None:
+        with self.lock:
+            self.free_slots.extend(slots)
+            self.lock.notify_all()
+
+    def frame_buffer(self, slot: int, shape) -> np.ndarray:
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shared_memory.buf, offset=slot * self.slot_bytes)
+
+    def oldest_pending_age(self) -> float:
+        with self.lock:
+            if not self.pending:
+                return 0.0
+            return perf_counter() - min(sent_at for _, _, sent_at in self.pending.values())
+
+    def fail_pending(self, error: Exception) -> None:
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            for _, slots, _ in pending.values():
+                self.free_slots.extend(slots)
+            self.lock.notify_all()
+        for future, _, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+class InferenceWorkerPool:
+    """
+    Runs detection in separate worker processes, each with its own detector
+    session, so inference does not compete with the API process for the GIL.
+
+    Every worker owns a shared-memory ring of fixed-size frame slots. Frames
+    are copied into free slots and only the slot numbers and shapes travel
+    over the worker's pipe; detections come back over the same pipe. Frames
+    that do not fit a slot are sent inline instead. A monitor thread pings
+    idle workers and restarts any worker whose process died or that has not
+    answered within timeout seconds, failing its in-flight requests.
+
+    Each request names the model file and backend to run. Workers keep the
+    few most recently used detectors loaded and reload one when its file
+    changes on disk.
+    """
+
+    def __init__(self, num_workers: int = INFERENCE_WORKERS, model_path: str = DEFAULT_MODEL_PATH, backend: str = DETECTOR_BACKEND,
+                 slots: int = INFERENCE_WORKER_SLOTS, slot_bytes: int = INFERENCE_WORKER_SLOT_BYTES,
+                 timeout: float = INFERENCE_WORKER_TIMEOUT, health_interval: float = INFERENCE_WORKER_HEALTH_INTERVAL):
+        self.model_path = model_path
+        self.backend = backend
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._request_ids = itertools.count()
+        self._stop_event = threading.Event()
+        self._workers = [_WorkerHandle(index, max(1, slots), slot_bytes) for index in range(max(1, num_workers))]
+
+        for worker in self._workers:
+            self._start_worker(worker)
+            get_metrics().register_gauge("vsl_queue_depth", lambda worker=worker: len(worker.pending), queue=f"inference_worker_{worker.index}")
+
+        self._monitor = threading.Thread(target=self._monitor_workers, name="inference-worker-monitor", daemon=True)
+        self._monitor.start()
+
+    def submit_batch(self, frames: List[np.ndarray], input_size: int = 640, conf_threshold: Optional[float] = None,
+                     model: Optional[Tuple[str, str]] = None) -> Future:
+        worker = min(self._workers, key=lambda w: len(w.pending))
+        return self._submit(worker, frames, input_size, conf_threshold, model)
+
+    def detect_batch(self, frames: List[np.ndarray], batch_size: int = 8, input_size: int = 640, conf_threshold: Optional[float] = None,
+                     model: Optional[Tuple[str, str]] = None) -> List[List[Dict]]:
+        chunk_size = max(1, min(batch_size, self._workers[0].slots))
+        futures = [
+            self.submit_batch(frames[start:start + chunk_size], input_size=input_size, conf_threshold=conf_threshold, model=model)
+            for start in range(0, len(frames), chunk_size)
+        ]
+        return [detections for future in futures for detections in future.result()]
+
+    def warm_up(self, input_size: int = 640, model: Optional[Tuple[str, str]] = None) -> None:
+        frame = np.zeros((input_size, input_size, 3), dtype=np.uint8)
+        futures = [self._submit(worker, [frame], input_size, None, model) for worker in self._workers]
+        for future in futures:
+            future.result(timeout=self.timeout)
+
+    def get_stats(self) -> Dict:
+        return {
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid if worker.process else None,
+                    "alive": bool(worker.process and worker.process.is_alive()),
+                    "restarts": worker.restarts,
+                    "in_flight": len(worker.pending),
+                    "free_slots": len(worker.free_slots),
+                    "ping_ms": round(worker.ping_ms, 3) if worker.ping_ms is not None else None
+                }
+                for worker in self._workers
+            ]
+        }
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        for worker in self._workers:
+            self._stop_worker(worker)
+            worker.fail_pending(RuntimeError("Inference worker pool stopped"))
+            worker.shared_memory.close()
+            worker.shared_memory.unlink()
+
+    def _submit(self, worker: _WorkerHandle, frames: List[np.ndarray], input_size: int, conf_threshold: Optional[float],
+                model: Optional[Tuple[str, str]] = None) -> Future:
+        if len(frames) > worker.slots:
+            raise ValueError(f"Batch of {len(frames)} frames exceeds the {worker.slots} shared-memory slots of a worker")
+
+        fits = [frame.dtype == np.uint8 and frame.nbytes <= worker.slot_bytes for frame in frames]
+        slots = worker.acquire_slots(sum(fits))
+        free = iter(slots)
+        specs = []
+        for frame, fit in zip(frames, fits):
+            if fit:
+                slot = next(free)
+                worker.frame_buffer(slot, frame.shape)[...] = frame
+                specs.append(("shm", slot, frame.shape))
+            else:
+                specs.append(("array", frame))
+
+        model = model or (self.model_path, self.backend)
+        return self._send(worker, (next(self._request_ids), "detect", specs, model, input_size, conf_threshold), slots)
+
+    def _send(self, worker: _WorkerHandle, message: tuple, slots: List[int]) -> Future:
+        future = Future()
+        with worker.lock:
+            worker.pending[message[0]] = (future, slots, perf_counter())
+        try:
+            with worker.send_lock:
+                worker.connection.send(message)
+        except (OSError, ValueError) as e:
+            with worker.lock:
+                worker.pending.pop(message[0], None)
+            worker.release_slots(slots)
+            future.set_exception(RuntimeError(f"Inference worker {worker.index} is unavailable: {e}"))
+        return future
+
+    def _ping(self, worker: _WorkerHandle) -> None:
+        sent_at = perf_counter()
+        future = self._send(worker, (next(self._request_ids), "ping"), [])
+
+        def record(done: Future):
+            if done.exception() is None:
+                worker.ping_ms = 1000 * (perf_counter() - sent_at)
+        future.add_done_callback(record)
+
+    def _start_worker(self, worker: _WorkerHandle) -> None:
+        parent_connection, child_connection = self._context.Pipe()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(worker.shared_memory.name, worker.slot_bytes, self.model_path, self.backend, child_connection),
+            name=f"inference-worker-{worker.index}",
+            daemon=True
+        )
+        worker.process.start()
+        child_connection.close()
+        worker.connection = parent_connection
+        threading.Thread(target=self._receive, args=(worker, parent_connection), name=f"inference-worker-{worker.index}-results", daemon=True).start()
+
+    def _stop_worker(self, worker: _WorkerHandle) -> None:
+        try:
+            with worker.send_lock:
+                worker.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        worker.process.join(timeout=1)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(timeout=1)
+        worker.connection.close()
+
+    def _restart_worker(self, worker: _WorkerHandle, reason: str) -> None:
+        print(f"Restarting inference worker {worker.index}: {reason}")
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=1)
+        worker.connection.close()
+        worker.fail_pending(RuntimeError(f"Inference worker {worker.index} restarted: {reason}"))
+        worker.restarts += 1
+        self._start_worker(worker)
+
+    def _receive(self, worker: _WorkerHandle, connection) -> None:
+        while True:
+            try:
+                request_id, result, error = connection.recv()
+            except (EOFError, OSError):
+                return
+
+            with worker.lock:
+                entry = worker.pending.pop(request_id, None)
+            if entry is None:
+                continue
+
+            future, slots, _ = entry
+            worker.release_slots(slots)
+            if error is not None:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(result)
+
+    def _monitor_workers(self) -> None:
+        while not self._stop_event.wait(self.health_interval):
+            for worker in self._workers:
+                if self._stop_event.is_set():
+                    return
+                if not worker.process.is_alive():
+                    self._restart_worker(worker, f"process exited with code {worker.process.exitcode}")
+                elif worker.oldest_pending_age() > self.timeout:
+                    self._restart_worker(worker, f"no reply within {self.timeout:.0f}s")
+                elif not worker.pending:
+                    self._ping(worker)
+
+
+_worker_pool_instance: Optional[InferenceWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+def get_inference_worker_pool() -> InferenceWorkerPool:
+    global _worker_pool_instance
+    if _worker_pool_instance is None:
+        with _worker_pool_lock:
+            if _worker_pool_instance is None:
+                _worker_pool_instance = InferenceWorkerPool()
+    return _worker_pool_instance
+
+def shutdown_inference_worker_pool():
+    global _worker_pool_instance
+    if _worker_pool_instance is not None:
+        _worker_pool_instance.stop()
+        _worker_pool_instance = None
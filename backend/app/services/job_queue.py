@@ -0,0 +1,200 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import time
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+from app.core.config import JOBS_DIR, JOB_WORKERS, JOB_MAX_QUEUE_DEPTH, JOB_MAX_RETAINED
+from app.services.metrics import STAGE_DURATION, get_metrics
+from app.utils.file_utils import cleanup_jobs_directory, remove_directory, safe_remove_file
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str, filename: str, input_path: Path, model: Optional[str] = None):
+        self.id = uuid4().hex
+        self.kind = kind
+        self.filename = filename
+        self.model = model
+        self.input_path = input_path
+        self.output_dir = JOBS_DIR / self.id
+        self.output_path: Optional[Path] = None
+        self.cache_key: Optional[str] = None
+        self.status = JobStatus.QUEUED
+        self.frames_done = 0
+        self.frames_total = 0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.exception: Optional[Exception] = None
+        self.created_at = time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    @property
+    def result_url(self) -> Optional[str]:
+        if self.status != JobStatus.COMPLETED or self.output_path is None:
+            return None
+        return f"/v1/detections/result/{self.id}"
+
+    def update_progress(self, frames_done: int, frames_total: int) -> None:
+        self.frames_done = frames_done
+        self.frames_total = frames_total
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "type": self.kind,
+            "filename": self.filename,
+            "model": self.model,
+            "status": self.status,
+            "progress": {
+                "frames_done": self.frames_done,
+                "frames_total": self.frames_total,
+                "percent": round(100 * self.frames_done / self.frames_total, 1) if self.frames_total else None
+            },
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result_url": self.result_url,
+            "result": self.result
+        }
+
+
+class JobManager:
+    """
+    Runs detection jobs on a bounded worker pool.
+
+    Each job writes into its own directory under JOBS_DIR, so concurrent
+    uploads never touch each other's output. Submissions are rejected with
+    QueueFullError once max_queue_depth jobs are waiting for a worker. Only
+    the most recent max_retained jobs are kept; older ones are forgotten and
+    their output directories removed.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_queue_depth: int = JOB_MAX_QUEUE_DEPTH, max_retained: int = JOB_MAX_RETAINED):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detection-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        cleanup_jobs_directory()
+        get_metrics().register_gauge("vsl_queue_depth", self._queued_count, queue="jobs")
+
+    def submit(self, job: Job, process_fn: Callable[[Job], Dict]) -> Job:
+        with self._lock:
+            if self._count(JobStatus.QUEUED) >= self.max_queue_depth:
+                raise QueueFullError(f"Job queue is full ({self.max_queue_depth} jobs waiting)")
+            self._jobs[job.id] = job
+            self._evict_finished_jobs()
+            job.future = self._executor.submit(self._run, job, process_fn)
+        return job
+
+    def complete(self, job: Job, result: Dict, output_path: Optional[Path]) -> Job:
+        job.result = result
+        job.output_path = output_path
+        job.status = JobStatus.COMPLETED
+        job.started_at = job.finished_at = time()
+        safe_remove_file(job.input_path)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished_jobs()
+        return job
+
+    async def wait(self, job: Job) -> Job:
+        if job.future is not None:
+            await asyncio.wrap_future(job.future)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest_completed(self) -> Optional[Job]:
+        with self._lock:
+            completed = [job for job in self._jobs.values() if job.status == JobStatus.COMPLETED]
+        return max(completed, key=lambda job: job.finished_at, default=None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self._count(JobStatus.QUEUED),
+                "running": self._count(JobStatus.RUNNING),
+                "max_queue_depth": self.max_queue_depth,
+                "retained_jobs": len(self._jobs)
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, process_fn: Callable[[Job], Dict]) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time()
+        job.output_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            job.result = process_fn(job)
+            job.status = JobStatus.COMPLETED
+        except Exception as e:
+            job.exception = e
+            job.error = str(getattr(e, "detail", e))
+            job.status = JobStatus.FAILED
+            print(f"Job {job.id} failed: {job.error}")
+        finally:
+            job.finished_at = time()
+            safe_remove_file(job.input_path)
+            metrics = get_metrics()
+            metrics.increment("vsl_jobs_finished_total", kind=job.kind, status=job.status)
+            metrics.observe(STAGE_DURATION, job.finished_at - job.started_at, stage=f"{job.kind}_job")
+
+    def _queued_count(self) -> int:
+        with self._lock:
+            return self._count(JobStatus.QUEUED)
+
+    def _count(self, job_status: str) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == job_status)
+
+    def _evict_finished_jobs(self) -> None:
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_retained:
+                break
+            job = self._jobs[job_id]
+            if job.finished:
+                del self._jobs[job_id]
+                remove_directory(job.output_dir)
+
+
+_job_manager_instance: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    global _job_manager_instance
+    if _job_manager_instance is None:
+        _job_manager_instance = JobManager()
+    return _job_manager_instance
+
+def shutdown_job_manager():
+    global _job_manager_instance
+    if _job_manager_instance is not None:
+        _job_manager_instance.shutdown()
+        _job_manager_instance = None
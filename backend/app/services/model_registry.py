@@ -0,0 +1,226 @@
+import os
+import threading
+from collections import OrderedDict
+from time import perf_counter, time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    CONF_THRESHOLD, DEFAULT_MODEL_VARIANT, DETECTOR_BACKEND, MODEL_REGISTRY_MAX_BYTES, MODEL_RELOAD_CHECK_SECONDS,
+    MODEL_VARIANTS
+)
+from app.services.detector import SignLanguageDetector, create_detector
+
+SessionKey = Tuple[str, str]
+
+
+def model_file_version(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+class DetectorCache:
+    """
+    Small process-local cache of detectors keyed by model file and backend,
+    for worker processes that cannot use the registry. A detector is
+    recreated when its file changes on disk.
+    """
+
+    def __init__(self, max_models: int = 2):
+        self.max_models = max(1, max_models)
+        self._detectors: "OrderedDict[SessionKey, Tuple[SignLanguageDetector, int]]" = OrderedDict()
+
+    def get(self, model_path: str, backend: str) -> SignLanguageDetector:
+        key = (model_path, backend)
+        version = model_file_version(model_path)
+        entry = self._detectors.get(key)
+        if entry is None or entry[1] != version:
+            entry = (create_detector(model_path, backend), version)
+            self._detectors[key] = entry
+        self._detectors.move_to_end(key)
+        while len(self._detectors) > self.max_models:
+            self._detectors.popitem(last=False)
+        return entry[0]
+
+
+class ModelVariant:
+    def __init__(self, name: str, path: str, backend: str = DETECTOR_BACKEND, input_size: int = 640, conf_threshold: float = CONF_THRESHOLD):
+        self.name = name
+        self.path = str(path)
+        self.backend = backend
+        self.input_size = int(input_size)
+        self.conf_threshold = float(conf_threshold)
+
+    @property
+    def key(self) -> SessionKey:
+        return self.path, self.backend
+
+    def to_dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "backend": self.backend,
+            "input_size": self.input_size,
+            "conf_threshold": self.conf_threshold
+        }
+
+
+class _LoadedSession:
+    __slots__ = ("detector", "version", "size_bytes", "loaded_at", "checked_at")
+
+    def __init__(self, detector: SignLanguageDetector, version: int, size_bytes: int):
+        self.detector = detector
+        self.version = version
+        self.size_bytes = size_bytes
+        self.loaded_at = time()
+        self.checked_at = perf_counter()
+
+
+class ModelRegistry:
+    """
+    Maps named model variants (file, backend, input size, threshold) to
+    loaded detector sessions.
+
+    Variants that share a file and backend share one session. Loaded
+    sessions are kept in LRU order and the least recently used ones are
+    dropped once their model files add up to more than max_bytes. When a
+    model file changes on disk, a new session is loaded and warmed up in the
+    background and then swapped in; requests that already hold the old
+    detector finish on it.
+    """
+
+    def __init__(self, variants: Dict[str, Dict] = MODEL_VARIANTS, default_variant: str = DEFAULT_MODEL_VARIANT,
+                 max_bytes: int = MODEL_REGISTRY_MAX_BYTES, reload_check_seconds: float = MODEL_RELOAD_CHECK_SECONDS):
+        self.variants = {name: ModelVariant(name, **spec) for name, spec in variants.items()}
+        self.default_variant = default_variant if default_variant in self.variants else next(iter(self.variants))
+        self.max_bytes = max_bytes
+        self.reload_check_seconds = reload_check_seconds
+        self.reloads = 0
+        self.evictions = 0
+        self._sessions: "OrderedDict[SessionKey, _LoadedSession]" = OrderedDict()
+        self._load_locks: Dict[SessionKey, threading.Lock] = {}
+        self._reloading = set()
+        self._lock = threading.Lock()
+
+    def variant(self, name: Optional[str] = None) -> ModelVariant:
+        name = name or self.default_variant
+        if name not in self.variants:
+            raise KeyError(f"Unknown model variant: {name}. Available variants: {', '.join(self.variants)}")
+        return self.variants[name]
+
+    def get_detector(self, name: Optional[str] = None) -> SignLanguageDetector:
+        key = self.variant(name).key
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+
+        if session is None:
+            with self._load_lock(key):
+                with self._lock:
+                    session = self._sessions.get(key)
+                if session is None:
+                    session = self._load(key)
+                    self._install(key, session)
+        else:
+            self._check_for_update(key, session)
+
+        return session.detector
+
+    def reload(self, name: Optional[str] = None) -> Dict:
+        key = self.variant(name).key
+        with self._load_lock(key):
+            self._install(key, self._load(key))
+            self.reloads += 1
+        return self.get_stats()["sessions"][self._session_name(key)]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            sessions = {
+                self._session_name(key): {
+                    "path": key[0],
+                    "backend": key[1],
+                    "version": session.version,
+                    "size_mb": round(session.size_bytes / (1024 * 1024), 2),
+                    "loaded_at": session.loaded_at
+                }
+                for key, session in self._sessions.items()
+            }
+        return {
+            "default_variant": self.default_variant,
+            "variants": {name: variant.to_dict() for name, variant in self.variants.items()},
+            "sessions": sessions,
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "reloads": self.reloads,
+            "evictions": self.evictions
+        }
+
+    def _load(self, key: SessionKey) -> _LoadedSession:
+        path, backend = key
+        version = model_file_version(path)
+        start = perf_counter()
+        detector = create_detector(path, backend)
+
+        for input_size in sorted({variant.input_size for variant in self.variants.values() if variant.key == key}):
+            detector.detect(np.zeros((input_size, input_size, 3), dtype=np.uint8), input_size=input_size)
+
+        print(f"Loaded model {path} ({backend}) in {perf_counter() - start:.2f}s")
+        return _LoadedSession(detector, version, os.path.getsize(path) if os.path.exists(path) else 0)
+
+    def _install(self, key: SessionKey, session: _LoadedSession) -> None:
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+
+            while len(self._sessions) > 1 and sum(s.size_bytes for s in self._sessions.values()) > self.max_bytes:
+                evicted_key, _ = self._sessions.popitem(last=False)
+                self.evictions += 1
+                print(f"Evicted model {evicted_key[0]} ({evicted_key[1]}) from memory")
+
+    def _check_for_update(self, key: SessionKey, session: _LoadedSession) -> None:
+        now = perf_counter()
+        if now - session.checked_at < self.reload_check_seconds:
+            return
+        session.checked_at = now
+
+        if model_file_version(key[0]) == session.version:
+            return
+        with self._lock:
+            if key in self._reloading:
+                return
+            self._reloading.add(key)
+        threading.Thread(target=self._reload_in_background, args=(key,), name="model-reload", daemon=True).start()
+
+    def _reload_in_background(self, key: SessionKey) -> None:
+        try:
+            with self._load_lock(key):
+                self._install(key, self._load(key))
+                self.reloads += 1
+        except Exception as e:
+            print(f"Error reloading model {key[0]}, keeping the loaded version: {e}")
+        finally:
+            with self._lock:
+                self._reloading.discard(key)
+
+    def _load_lock(self, key: SessionKey) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _session_name(key: SessionKey) -> str:
+        return f"{key[1]}:{key[0]}"
+
+
+_registry_instance: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = ModelRegistry()
+    return _registry_instance
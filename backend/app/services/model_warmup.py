@@ -0,0 +1,128 @@
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app.core.config import INFERENCE_WORKERS, REALTIME_MODEL_VARIANT
+from app.services.detector import get_detector
+from app.services.inference_workers import get_inference_worker_pool
+from app.services.model_registry import get_model_registry
+from app.services.paraphrase_cache import prewarm_paraphrase_cache
+from app.services.paraphraser import get_paraphraser
+
+
+class ModelState:
+    PENDING = "pending"
+    LOADING = "loading"
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ModelStatus:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = ModelState.PENDING
+        self.load_seconds: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "warmup_ms": round(self.warmup_ms, 3) if self.warmup_ms is not None else None,
+            "error": self.error
+        }
+
+
+class ModelWarmup:
+    """
+    Loads the detector and the paraphraser on background threads at startup
+    and runs a dummy inference through each, so the first real request does
+    not pay for model loading or lazy runtime initialisation. Every
+    configured model variant is loaded and warmed at its own input size.
+    """
+
+    def __init__(self):
+        self.models = {
+            "detector": ModelStatus("detector"),
+            "paraphraser": ModelStatus("paraphraser"),
+        }
+        if INFERENCE_WORKERS > 0:
+            self.models["inference_workers"] = ModelStatus("inference_workers")
+        self._threads = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        loaders = [
+            ("detector", get_detector, self._warm_detector),
+            ("paraphraser", get_paraphraser, self._warm_paraphraser),
+        ]
+        if "inference_workers" in self.models:
+            loaders.append(("inference_workers", get_inference_worker_pool, self._warm_worker_pool))
+
+        for name, load_fn, warm_fn in loaders:
+            thread = threading.Thread(target=self._load, args=(self.models[name], load_fn, warm_fn), name=f"{name}-warmup", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        for thread in self._threads:
+            thread.join(timeout)
+        return self.is_ready()
+
+    def is_ready(self) -> bool:
+        return all(status.state == ModelState.READY for status in self.models.values())
+
+    def get_status(self) -> Dict:
+        return {
+            "ready": self.is_ready(),
+            "models": {name: status.to_dict() for name, status in self.models.items()}
+        }
+
+    def _load(self, status: ModelStatus, load_fn: Callable, warm_fn: Callable) -> None:
+        try:
+            status.state = ModelState.LOADING
+            start = perf_counter()
+            model = load_fn()
+            status.load_seconds = perf_counter() - start
+
+            status.state = ModelState.WARMING_UP
+            start = perf_counter()
+            warm_fn(model)
+            status.warmup_ms = 1000 * (perf_counter() - start)
+
+            status.state = ModelState.READY
+            print(f"{status.name} ready (load {status.load_seconds:.2f}s, warm-up {status.warmup_ms:.1f}ms)")
+        except Exception as e:
+            status.state = ModelState.FAILED
+            status.error = str(e)
+            print(f"Error warming up {status.name}: {e}")
+
+    @staticmethod
+    def _warm_detector(detector) -> None:
+        registry = get_model_registry()
+        for variant in registry.variants.values():
+            registry.get_detector(variant.name).detect(np.zeros((variant.input_size, variant.input_size, 3), dtype=np.uint8), input_size=variant.input_size)
+
+    @staticmethod
+    def _warm_worker_pool(pool) -> None:
+        variant = get_model_registry().variant(REALTIME_MODEL_VARIANT)
+        pool.warm_up(variant.input_size, model=variant.key)
+
+    @staticmethod
+    def _warm_paraphraser(paraphraser) -> None:
+        paraphraser.paraphrase_batch(["xin chào tôi tên là"])
+        prewarm_paraphrase_cache()
+
+
+_warmup_instance: Optional[ModelWarmup] = None
+
+def get_model_warmup() -> ModelWarmup:
+    global _warmup_instance
+    if _warmup_instance is None:
+        _warmup_instance = ModelWarmup()
+    return _warmup_instance
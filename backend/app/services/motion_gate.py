@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+
+from app.core.config import MOTION_GATE_THRESHOLD, MOTION_GATE_MAX_STRIDE, MOTION_GATE_SAMPLE_SIZE
+
+
+class MotionGate:
+    """
+    Decides whether a frame differs enough from the last inferred frame to be
+    worth running the detector on.
+
+    Frames are compared as small grayscale thumbnails using the mean absolute
+    pixel difference. A frame is always inferred once max_stride frames have
+    passed without inference, so slow drift is never missed for long.
+    """
+
+    def __init__(self, threshold: float = MOTION_GATE_THRESHOLD, max_stride: int = MOTION_GATE_MAX_STRIDE, sample_size: int = MOTION_GATE_SAMPLE_SIZE):
+        self.threshold = threshold
+        self.max_stride = max(1, max_stride)
+        self.sample_size = sample_size
+        self.frames_seen = 0
+        self.frames_inferred = 0
+        self._reference = None
+        self._frames_since_inference = 0
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        thumbnail = self._thumbnail(frame)
+        self.frames_seen += 1
+
+        infer = (
+            self._reference is None
+            or self.threshold <= 0
+            or self._frames_since_inference + 1 >= self.max_stride
+            or float(cv2.absdiff(thumbnail, self._reference).mean()) >= self.threshold
+        )
+
+        if infer:
+            self._reference = thumbnail
+            self._frames_since_inference = 0
+            self.frames_inferred += 1
+        else:
+            self._frames_since_inference += 1
+
+        return infer
+
+    def reset(self) -> None:
+        self._reference = None
+        self._frames_since_inference = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, (self.sample_size, self.sample_size), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
@@ -0,0 +1,139 @@
+import ast
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import ONNX_INTRA_OP_THREADS, ONNX_INTER_OP_THREADS, ONNX_IOU_THRESHOLD, VIDEO_BATCH_SIZE
+from app.services.detector import SignLanguageDetector
+from app.services.metrics import get_metrics, time_stage
+from app.services.preprocessing import LetterboxTransform
+
+MAX_DETECTIONS = 1
+
+
+def static_input_shape(shape: Sequence) -> Tuple[Optional[int], Optional[int]]:
+    batch_size, input_size = shape[0], shape[2]
+    return batch_size if isinstance(batch_size, int) else None, input_size if isinstance(input_size, int) else None
+
+
+class OnnxSignLanguageDetector(SignLanguageDetector):
+    """
+    Runs an ultralytics-exported YOLO .onnx model directly on ONNX Runtime.
+
+    Keeps the SignLanguageDetector contract (detect, detect_batch,
+    detect_from_image, process_video_frames) without importing torch or
+    ultralytics. Decoding/NMS are vectorized with NumPy.
+    """
+
+    def _load_and_optimize_model(self):
+        try:
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+            options.inter_op_num_threads = ONNX_INTER_OP_THREADS
+
+            available = ort.get_available_providers()
+            providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+            session = ort.InferenceSession(self.model_path, sess_options=options, providers=providers)
+
+            model_input = session.get_inputs()[0]
+            self.input_name = model_input.name
+            self.fixed_batch_size, self.fixed_input_size = static_input_shape(model_input.shape)
+            self.names = self._read_class_names(session)
+            self.device = 'cuda' if session.get_providers()[0] == "CUDAExecutionProvider" else 'cpu'
+
+            print(f"ONNX Runtime model loaded from: {self.model_path}")
+            print(f"Using device: {self.device}")
+            return session
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model from {self.model_path}: {e}")
+
+    def detect_batch(self, frames: List[np.ndarray], batch_size: int = VIDEO_BATCH_SIZE, input_size: int = 640, conf_threshold: Optional[float] = None) -> List[List[Dict]]:
+        conf_threshold = self.conf_threshold if conf_threshold is None else conf_threshold
+        input_size = self.resolve_input_size(input_size)
+        batch_size = max(1, self.fixed_batch_size or batch_size)
+        batch_detections = []
+
+        for start in range(0, len(frames), batch_size):
+            batch = frames[start:start + batch_size]
+
+            with self.predict_lock:
+                with time_stage("resize"):
+                    input_tensor, transforms = self.input_pool.fill(batch, input_size, pad_to=self.fixed_batch_size)
+                with time_stage("inference"):
+                    outputs = self.model.run(None, {self.input_name: input_tensor})[0]
+
+            with time_stage("postprocess"):
+                for prediction, transform in zip(outputs, transforms):
+                    batch_detections.append(self._postprocess(prediction, transform, conf_threshold))
+
+        get_metrics().increment("vsl_inference_frames_total", len(frames))
+        return batch_detections
+
+    def _postprocess(self, prediction: np.ndarray, transform: LetterboxTransform, conf_threshold: float) -> List[Dict]:
+        if prediction.shape[0] < prediction.shape[1]:
+            prediction = prediction.T
+
+        class_scores = prediction[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(class_ids)), class_ids]
+
+        keep = confidences >= conf_threshold
+        if not keep.any():
+            return []
+
+        boxes = self._xywh_to_xyxy(prediction[keep, :4])
+        confidences = confidences[keep]
+        class_ids = class_ids[keep]
+
+        kept = self._non_max_suppression(boxes, confidences, ONNX_IOU_THRESHOLD, MAX_DETECTIONS)
+        boxes = transform.to_frame(boxes[kept])
+
+        return [
+            {
+                "class_name": self.names.get(int(class_id), str(class_id)),
+                "confidence": float(confidence),
+                "bbox": box.tolist()
+            }
+            for box, confidence, class_id in zip(boxes, confidences[kept], class_ids[kept])
+        ]
+
+    @staticmethod
+    def _xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+        xyxy = np.empty_like(boxes)
+        half_w, half_h = boxes[:, 2] / 2, boxes[:, 3] / 2
+        xyxy[:, 0] = boxes[:, 0] - half_w
+        xyxy[:, 1] = boxes[:, 1] - half_h
+        xyxy[:, 2] = boxes[:, 0] + half_w
+        xyxy[:, 3] = boxes[:, 1] + half_h
+        return xyxy
+
+    @staticmethod
+    def _non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float, max_detections: int) -> np.ndarray:
+        order = scores.argsort()[::-1]
+        if max_detections == 1:
+            return order[:1]
+
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        kept = []
+        while order.size and len(kept) < max_detections:
+            best, rest = order[0], order[1:]
+            kept.append(best)
+
+            top_left = np.maximum(boxes[best, :2], boxes[rest, :2])
+            bottom_right = np.minimum(boxes[best, 2:], boxes[rest, 2:])
+            intersection = np.prod((bottom_right - top_left).clip(0), axis=1)
+            iou = intersection / (areas[best] + areas[rest] - intersection + 1e-9)
+            order = rest[iou < iou_threshold]
+
+        return np.array(kept, dtype=np.int64)
+
+    @staticmethod
+    def _read_class_names(session) -> Dict[int, str]:
+        metadata = session.get_modelmeta().custom_metadata_map
+        try:
+            return {int(k): v for k, v in ast.literal_eval(metadata.get("names", "{}")).items()}
+        except (ValueError, SyntaxError):
+            return {}
@@ -0,0 +1,170 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from time import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import (
+    PARAPHRASE_CACHE_PATH, PARAPHRASE_CACHE_MEMORY_SIZE, PARAPHRASE_CACHE_DISK_SIZE,
+    PARAPHRASE_CACHE_TTL_SECONDS, PARAPHRASE_PREWARM_FILE, PARAPHRASE_BATCH_SIZE
+)
+from app.services.paraphraser import get_paraphraser
+
+
+def normalize_words(words: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(part for word in words for part in word.strip().lower().split())
+
+
+class ParaphraseCache:
+    """
+    Caches paraphrases keyed by the normalized word sequence.
+
+    Lookups go to an in-memory LRU first, then to a sqlite store that
+    survives restarts. Entries older than ttl_seconds are regenerated. The
+    paraphrase function is only called on a miss, so the MT5 model is not
+    loaded as long as every request hits the cache.
+    """
+
+    def __init__(self, paraphrase_fn: Callable[[str], str], db_path: Optional[Path] = PARAPHRASE_CACHE_PATH,
+                 memory_size: int = PARAPHRASE_CACHE_MEMORY_SIZE, disk_size: int = PARAPHRASE_CACHE_DISK_SIZE,
+                 ttl_seconds: float = PARAPHRASE_CACHE_TTL_SECONDS,
+                 batch_fn: Optional[Callable[[List[str]], List[str]]] = None):
+        self.paraphrase_fn = paraphrase_fn
+        self.batch_fn = batch_fn
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(db_path) if db_path is not None else None
+
+    def paraphrase(self, words: Sequence[str]) -> str:
+        key = " ".join(normalize_words(words))
+        if not key:
+            return ""
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        sentence = self.paraphrase_fn(key)
+        self._store(key, sentence)
+        return sentence
+
+    def paraphrase_many(self, word_sequences: Sequence[Sequence[str]]) -> List[str]:
+        keys = [" ".join(normalize_words(words)) for words in word_sequences]
+        results = [self._lookup(key) if key else "" for key in keys]
+        missing = list(dict.fromkeys(key for key, result in zip(keys, results) if result is None))
+        if not missing:
+            return results
+
+        sentences = self.batch_fn(missing) if self.batch_fn else [self.paraphrase_fn(key) for key in missing]
+        generated = dict(zip(missing, sentences))
+        for key, sentence in generated.items():
+            self._store(key, sentence)
+        return [generated[key] if result is None else result for key, result in zip(keys, results)]
+
+    def prewarm(self, phrases: Iterable[str], batch_size: int = PARAPHRASE_BATCH_SIZE) -> int:
+        word_sequences = [phrase.split() for phrase in phrases if phrase.strip()]
+        for start in range(0, len(word_sequences), batch_size):
+            self.paraphrase_many(word_sequences[start:start + batch_size])
+        return len(word_sequences)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._db.execute("SELECT COUNT(*) FROM paraphrases").fetchone()[0] if self._db else 0
+            }
+
+    def _lookup(self, key: str) -> Optional[str]:
+        now = time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[1], now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM paraphrases WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute("UPDATE paraphrases SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, sentence: str) -> None:
+        now = time()
+        with self._lock:
+            self._remember(key, sentence, now)
+            if self._db is None:
+                return
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO paraphrases (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sentence, now, now)
+            )
+            self._db.execute(
+                "DELETE FROM paraphrases WHERE key IN "
+                "(SELECT key FROM paraphrases ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_size,)
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, sentence: str, created_at: float) -> None:
+        self._memory[key] = (sentence, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    @staticmethod
+    def _open_db(db_path: Path) -> sqlite3.Connection:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(db_path), check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS paraphrases ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS paraphrases_accessed_at ON paraphrases (accessed_at)")
+        db.commit()
+        return db
+
+
+def _paraphrase_with_model(text: str) -> str:
+    return get_paraphraser().paraphrase(text)
+
+def _paraphrase_batch_with_model(texts: List[str]) -> List[str]:
+    return get_paraphraser().paraphrase_batch(texts)
+
+@lru_cache
+def get_paraphrase_cache() -> ParaphraseCache:
+    return ParaphraseCache(_paraphrase_with_model, batch_fn=_paraphrase_batch_with_model)
+
+def prewarm_paraphrase_cache() -> None:
+    if not PARAPHRASE_PREWARM_FILE.exists():
+        return
+    try:
+        phrases = PARAPHRASE_PREWARM_FILE.read_text(encoding="utf-8").splitlines()
+        warmed = get_paraphrase_cache().prewarm(phrases)
+        print(f"Paraphrase cache pre-warmed with {warmed} phrases")
+    except Exception as e:
+        print(f"Error pre-warming paraphrase cache: {e}")
@@ -1,24 +1,52 @@
-from transformers import MT5Tokenizer, MT5ForConditionalGeneration
-from functools import lru_cache
+import threading
+from typing import List, Optional
+
+from app.core.config import PARAPHRASE_QUANTIZE
+from app.services.metrics import time_stage
 
 CKPT = 'chieunq/vietnamese-sentence-paraphase'
 
 class Paraphraser:
-    def __init__(self):
+    def __init__(self, quantize: bool = PARAPHRASE_QUANTIZE):
+        import torch
+        from transformers import MT5Tokenizer, MT5ForConditionalGeneration
+
         self.tokenizer = MT5Tokenizer.from_pretrained(CKPT, legacy=True)
-        self.model = MT5ForConditionalGeneration.from_pretrained(CKPT)
-        print("Vietnamese MT5 paraphrase model loaded successfully")
+        self.model = MT5ForConditionalGeneration.from_pretrained(CKPT).eval()
+        self.quantized = quantize
+        
+        if quantize:
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        print(f"Vietnamese MT5 paraphrase model loaded successfully ({'int8' if quantize else 'fp32'})")
        
     def paraphrase(self, text: str) -> str:
-        if len(text.split()) <= 2:
-            return text
-            
-        inputs = self.tokenizer(text, padding='longest', max_length=16, return_tensors='pt')
-        input_ids = inputs.input_ids
-        attention_mask = inputs.attention_mask
-        output = self.model.generate(input_ids, attention_mask=attention_mask, max_length=16)
-        return self.tokenizer.decode(output[0], skip_special_tokens=True)
+        return self.paraphrase_batch([text])[0]
+    
+    def paraphrase_batch(self, texts: List[str]) -> List[str]:
+        import torch
+
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if len(text.split()) > 2]
+        if not pending:
+            return results
+        
+        with time_stage("paraphrase"):
+            inputs = self.tokenizer([texts[i] for i in pending], padding='longest', max_length=16, return_tensors='pt')
+            with torch.inference_mode():
+                output = self.model.generate(inputs.input_ids, attention_mask=inputs.attention_mask, max_length=16)
+            decoded = self.tokenizer.batch_decode(output, skip_special_tokens=True)
+        
+        for i, sentence in zip(pending, decoded):
+            results[i] = sentence
+        return results
+
+_paraphraser_instance: Optional[Paraphraser] = None
+_paraphraser_lock = threading.Lock()
 
-@lru_cache
-def get_paraphraser():
-    return Paraphraser()
\ No newline at end of file
+def get_paraphraser() -> Paraphraser:
+    global _paraphraser_instance
+    if _paraphraser_instance is None:
+        with _paraphraser_lock:
+            if _paraphraser_instance is None:
+                _paraphraser_instance = Paraphraser()
+    return _paraphraser_instance
@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+LETTERBOX_COLOR = 114
+
+
+class LetterboxTransform:
+    """
+    Exact mapping between a frame and its letterboxed copy: the frame was
+    scaled by scale and placed at (left, top) of the square input.
+    """
+
+    __slots__ = ("scale", "left", "top", "width", "height")
+
+    def __init__(self, scale: float, left: int, top: int, width: int, height: int):
+        self.scale = scale
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+    @property
+    def is_identity(self) -> bool:
+        return self.scale == 1.0 and self.left == 0 and self.top == 0
+
+    def to_frame(self, boxes: np.ndarray) -> np.ndarray:
+        if self.is_identity:
+            return boxes
+        boxes = (boxes - np.array([self.left, self.top, self.left, self.top], dtype=boxes.dtype)) / self.scale
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, self.width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, self.height)
+        return boxes
+
+    def map_detections(self, detections: List[Dict]) -> List[Dict]:
+        if self.is_identity:
+            return detections
+        for det in detections:
+            if det["bbox"] is not None:
+                det["bbox"] = self.to_frame(np.array([det["bbox"]], dtype=np.float32))[0].tolist()
+        return detections
+
+
+def letterbox_transform(frame_shape: Tuple[int, ...], input_size: int) -> LetterboxTransform:
+    h, w = frame_shape[:2]
+    if h == input_size and w == input_size:
+        return LetterboxTransform(1.0, 0, 0, w, h)
+    scale = min(input_size / h, input_size / w)
+    new_w, new_h = round(w * scale), round(h * scale)
+    return LetterboxTransform(scale, (input_size - new_w) // 2, (input_size - new_h) // 2, w, h)
+
+
+class Letterboxer:
+    """
+    Aspect-preserving resize into a reused square uint8 canvas.
+
+    Frames that already have the input size are returned as they are, so a
+    frame letterboxed once upstream is not copied or resized again.
+    """
+
+    def __init__(self, input_size: int):
+        self.input_size = input_size
+        self._canvas = np.full((input_size, input_size, 3), LETTERBOX_COLOR, dtype=np.uint8)
+        self._padding = None
+
+    def __call__(self, frame: np.ndarray) -> Tuple[np.ndarray, LetterboxTransform]:
+        transform = letterbox_transform(frame.shape, self.input_size)
+        if transform.is_identity:
+            return frame, transform
+
+        new_w, new_h = round(transform.width * transform.scale), round(transform.height * transform.scale)
+        left, top = transform.left, transform.top
+        padding = (left, top, new_w, new_h)
+        if padding != self._padding:
+            self._canvas.fill(LETTERBOX_COLOR)
+            self._padding = padding
+        self._canvas[top:top + new_h, left:left + new_w] = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        return self._canvas, transform
+
+
+class InputTensorPool:
+    """
+    Letterboxes batches of BGR frames into reused NCHW float32 RGB tensors,
+    one per input size, grown to the largest batch seen. The returned tensor
+    is only valid until the next fill for the same input size. With pad_to,
+    the tensor is padded with unused rows up to that batch size.
+    """
+
+    def __init__(self):
+        self._tensors: Dict[int, np.ndarray] = {}
+        self._letterboxers: Dict[int, Letterboxer] = {}
+
+    def fill(self, frames: List[np.ndarray], input_size: int, pad_to: Optional[int] = None) -> Tuple[np.ndarray, List[LetterboxTransform]]:
+        rows = max(len(frames), pad_to or 0)
+        tensor = self._tensors.get(input_size)
+        if tensor is None or tensor.shape[0] < rows:
+            tensor = self._tensors[input_size] = np.zeros((rows, 3, input_size, input_size), dtype=np.float32)
+        letterboxer = self._letterboxers.get(input_size)
+        if letterboxer is None:
+            letterboxer = self._letterboxers[input_size] = Letterboxer(input_size)
+
+        transforms = []
+        for i, frame in enumerate(frames):
+            canvas, transform = letterboxer(frame)
+            np.multiply(canvas[..., ::-1].transpose(2, 0, 1), 1 / 255, out=tensor[i], casting="unsafe")
+            transforms.append(transform)
+        return tensor[:rows], transforms
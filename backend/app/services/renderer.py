@@ -0,0 +1,133 @@
+import cv2
+import numpy as np
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.core.config import FONT_PATH, LABEL_FONT_SIZE, LABEL_SPRITE_CACHE_SIZE
+from app.services.metrics import time_stage
+
+BOX_COLOR = (0, 255, 0)
+TEXT_COLOR = (0, 0, 0)
+
+
+class AnnotationRenderer:
+    """
+    Draws detection boxes and labels directly into BGR frames.
+
+    The font is loaded once and each label is rendered only the first time a
+    (class, confidence bucket) pair is seen. Later draws alpha-blend the
+    cached sprite into the frame region it covers, so the rest of the frame
+    is never copied or converted. draw modifies and returns the frame it is
+    given; callers that still need the original pixels pass a copy.
+    """
+
+    def __init__(self, font_path: Path = FONT_PATH, font_size: int = LABEL_FONT_SIZE,
+                 cache_size: int = LABEL_SPRITE_CACHE_SIZE, confidence_step: float = 0.01):
+        self.font = self._load_font(font_path, font_size)
+        self.cache_size = cache_size
+        self.confidence_step = confidence_step
+        self._sprites = OrderedDict()
+        self._lock = threading.Lock()
+
+    def draw(self, frame: np.ndarray, detections: List[Dict], fps: Optional[float] = None) -> np.ndarray:
+        with time_stage("annotate"):
+            return self._draw(frame, detections, fps)
+
+    def _draw(self, frame: np.ndarray, detections: List[Dict], fps: Optional[float]) -> np.ndarray:
+        for det in detections:
+            if det.get("bbox") is None:
+                continue
+
+            x1, y1, x2, y2 = map(int, det["bbox"])
+            cv2.rectangle(frame, (x1, y1), (x2, y2), BOX_COLOR, 2)
+
+            sprite, alpha = self.label_sprite(det["class_name"], det["confidence"])
+            top = y1 - sprite.shape[0] if y1 - sprite.shape[0] >= 0 else y1
+            self._blend(frame, sprite, alpha, x1, top)
+
+        if fps is not None:
+            cv2.putText(frame, f'FPS: {int(fps)}', (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, BOX_COLOR, 2)
+
+        return frame
+
+    def label_sprite(self, class_name: str, confidence: float) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        bucket = int(round(confidence / self.confidence_step))
+        key = (class_name, bucket)
+
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                return sprite
+
+        sprite = self._render_label(f"{class_name}: {bucket * self.confidence_step:.2f}")
+
+        with self._lock:
+            self._sprites[key] = sprite
+            while len(self._sprites) > self.cache_size:
+                self._sprites.popitem(last=False)
+
+        return sprite
+
+    def get_stats(self) -> Dict:
+        return {
+            "cached_sprites": len(self._sprites),
+            "font": "truetype" if self.font is not None else "hershey"
+        }
+
+    def _render_label(self, text: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self.font is None:
+            (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_DUPLEX, 0.6, 1)
+            sprite = np.full((text_h + baseline + 6, text_w + 4, 3), BOX_COLOR, dtype=np.uint8)
+            cv2.putText(sprite, text, (2, text_h + 3), cv2.FONT_HERSHEY_DUPLEX, 0.6, TEXT_COLOR, 1, cv2.LINE_AA)
+            return sprite, None
+
+        left, top, right, bottom = self.font.getbbox(text)
+        size = (right - left + 4, bottom - top + 6)
+        image = Image.new("RGBA", size, BOX_COLOR[::-1] + (255,))
+        ImageDraw.Draw(image).text((2 - left, 3 - top), text, font=self.font, fill=TEXT_COLOR[::-1] + (255,))
+
+        rgba = np.asarray(image)
+        sprite = np.ascontiguousarray(rgba[:, :, 2::-1])
+        alpha = rgba[:, :, 3:]
+        if alpha.min() == 255:
+            return sprite, None
+        return sprite, alpha.astype(np.float32) / 255.0
+
+    @staticmethod
+    def _blend(frame: np.ndarray, sprite: np.ndarray, alpha: Optional[np.ndarray], x: int, y: int) -> None:
+        h, w = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite.shape[1], w), min(y + sprite.shape[0], h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        region = frame[y0:y1, x0:x1]
+        patch = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+        if alpha is None:
+            region[:] = patch
+            return
+
+        weight = alpha[y0 - y:y1 - y, x0 - x:x1 - x]
+        region[:] = (patch * weight + region * (1.0 - weight)).astype(np.uint8)
+
+    @staticmethod
+    def _load_font(font_path: Path, font_size: int):
+        if not font_path.exists():
+            print(f"Font not found at {font_path}, labels will not show Vietnamese characters")
+            return None
+        try:
+            return ImageFont.truetype(str(font_path), font_size)
+        except Exception as e:
+            print(f"Error loading font: {e}")
+            return None
+
+
+@lru_cache
+def get_annotation_renderer() -> AnnotationRenderer:
+    return AnnotationRenderer()
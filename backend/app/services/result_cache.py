@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from time import time
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.core.config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES
+from app.utils.file_utils import remove_directory
+
+RESULT_FILE = "result.json"
+
+
+class ResultCache:
+    """
+    Content-addressed cache of finished upload results.
+
+    An entry is keyed by the upload's content hash together with everything
+    that changes the output (model file, confidence threshold, upload type)
+    and stores the result JSON next to the annotated output file. Entries are
+    evicted least-recently-used first once their total size on disk exceeds
+    max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(content_hash: str, kind: str, model_path: str, conf_threshold: float, input_size: int = 640) -> str:
+        try:
+            model_version = os.stat(model_path).st_mtime_ns
+        except OSError:
+            model_version = 0
+        fingerprint = f"{content_hash}|{kind}|{model_path}|{model_version}|{conf_threshold}|{input_size}"
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict, Optional[Path]]]:
+        entry_dir = self.cache_dir / key
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                result = json.loads((entry_dir / RESULT_FILE).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            now = time()
+            os.utime(entry_dir / RESULT_FILE, (now, now))
+            self._entries[key] = (self._entries[key][0], now)
+            self.hits += 1
+
+        output_files = [path for path in entry_dir.iterdir() if path.name != RESULT_FILE]
+        return result, output_files[0] if output_files else None
+
+    def put(self, key: str, result: Dict, output_path: Optional[Path]) -> None:
+        entry_dir = self.cache_dir / key
+        staging_dir = self.cache_dir / f".{key}.{uuid4().hex}"
+
+        try:
+            staging_dir.mkdir(parents=True)
+            (staging_dir / RESULT_FILE).write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+            if output_path is not None and output_path.exists():
+                shutil.copy2(output_path, staging_dir / output_path.name)
+
+            with self._lock:
+                if key in self._entries:
+                    return
+                os.replace(staging_dir, entry_dir)
+                self._entries[key] = (self._directory_size(entry_dir), time())
+                self._evict()
+        except Exception as e:
+            print(f"Error caching result {key}: {e}")
+        finally:
+            remove_directory(staging_dir)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": sum(size for size, _ in self._entries.values()),
+                "max_bytes": self.max_bytes
+            }
+
+    def _evict(self) -> None:
+        total = sum(size for size, _ in self._entries.values())
+        for key, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            remove_directory(self.cache_dir / key)
+            del self._entries[key]
+            total -= size
+
+    def _load_index(self) -> None:
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.name.startswith("."):
+                remove_directory(entry_dir)
+                continue
+            result_file = entry_dir / RESULT_FILE
+            if result_file.exists():
+                self._entries[entry_dir.name] = (self._directory_size(entry_dir), result_file.stat().st_mtime)
+            else:
+                remove_directory(entry_dir)
+
+    @staticmethod
+    def _directory_size(directory: Path) -> int:
+        return sum(path.stat().st_size for path in directory.iterdir() if path.is_file())
+
+
+_result_cache_instance: Optional[ResultCache] = None
+
+def get_result_cache() -> ResultCache:
+    global _result_cache_instance
+    if _result_cache_instance is None:
+        _result_cache_instance = ResultCache()
+    return _result_cache_instance
@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import ROI_INPUT_SCALE, ROI_MIN_CONFIDENCE, ROI_PADDING, ROI_REFRESH_INTERVAL
+
+Region = Tuple[int, int, int, int]
+
+
+class RoiTracker:
+    """
+    Detect-then-track cascade for streams with a single signing region.
+
+    After a detection of at least min_confidence, the next frames are run on
+    a square crop around the previous box, padded by padding times its
+    longest side on every edge, at a smaller input size. Crop detections are
+    mapped back to frame coordinates. A full-frame pass is made whenever the
+    crop loses the target and every refresh_interval frames, so a signer who
+    moves away or a new signer is picked up again.
+    """
+
+    def __init__(self, input_size: int, input_scale: float = ROI_INPUT_SCALE, padding: float = ROI_PADDING,
+                 refresh_interval: int = ROI_REFRESH_INTERVAL, min_confidence: float = ROI_MIN_CONFIDENCE):
+        self.full_input_size = input_size
+        self.input_size = max(32, int(input_size * input_scale) // 32 * 32)
+        self.padding = padding
+        self.refresh_interval = max(1, refresh_interval)
+        self.min_confidence = min_confidence
+        self.frames_full = 0
+        self.frames_tracked = 0
+        self.frames_lost = 0
+        self._box: Optional[List[float]] = None
+        self._frames_since_full = 0
+
+    def plan(self, frame_shape: Tuple[int, ...]) -> Optional[Region]:
+        if self._box is None or self._frames_since_full + 1 >= self.refresh_interval:
+            self._frames_since_full = 0
+            self.frames_full += 1
+            return None
+        self._frames_since_full += 1
+        return self._region(self._box, frame_shape[:2])
+
+    @staticmethod
+    def crop(frame: np.ndarray, region: Region) -> np.ndarray:
+        x0, y0, x1, y1 = region
+        return frame[y0:y1, x0:x1]
+
+    def track(self, detections: List[Dict], region: Region) -> Optional[List[Dict]]:
+        x0, y0 = region[0], region[1]
+        for det in detections:
+            if det["bbox"] is not None:
+                det["bbox"] = [det["bbox"][0] + x0, det["bbox"][1] + y0, det["bbox"][2] + x0, det["bbox"][3] + y0]
+
+        if self._best(detections) is None:
+            self._frames_since_full = 0
+            self.frames_lost += 1
+            self.frames_full += 1
+            return None
+        self.frames_tracked += 1
+        return detections
+
+    def observe(self, detections: List[Dict]) -> None:
+        best = self._best(detections)
+        self._box = best["bbox"] if best is not None else None
+
+    def reset(self) -> None:
+        self._box = None
+        self._frames_since_full = 0
+
+    def detect_batch(self, detector, frames: List[np.ndarray], conf_threshold: Optional[float] = None) -> List[List[Dict]]:
+        regions = [self.plan(frame.shape) for frame in frames]
+        results: List[Optional[List[Dict]]] = [None] * len(frames)
+
+        tracked = [i for i, region in enumerate(regions) if region is not None]
+        if tracked:
+            crops = [self.crop(frames[i], regions[i]) for i in tracked]
+            for i, detections in zip(tracked, detector.detect_batch(crops, batch_size=len(crops), input_size=self.input_size, conf_threshold=conf_threshold)):
+                results[i] = self.track(detections, regions[i])
+
+        full = [i for i, detections in enumerate(results) if detections is None]
+        if full:
+            full_frames = [frames[i] for i in full]
+            for i, detections in zip(full, detector.detect_batch(full_frames, batch_size=len(full_frames), input_size=self.full_input_size, conf_threshold=conf_threshold)):
+                results[i] = detections
+
+        for detections in results:
+            self.observe(detections)
+        return results
+
+    def get_stats(self) -> Dict:
+        return {
+            "frames_full": self.frames_full,
+            "frames_tracked": self.frames_tracked,
+            "frames_lost": self.frames_lost
+        }
+
+    def _best(self, detections: List[Dict]) -> Optional[Dict]:
+        confident = [det for det in detections if det["bbox"] is not None and det["confidence"] >= self.min_confidence]
+        return max(confident, key=lambda det: det["confidence"]) if confident else None
+
+    def _region(self, box: List[float], frame_size: Tuple[int, int]) -> Region:
+        h, w = frame_size
+        x1, y1, x2, y2 = box
+        side = int(max(x2 - x1, y2 - y1) * (1 + 2 * self.padding))
+        side = min(max(side, self.input_size), h, w)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        return x0, y0, x0 + side, y0 + side
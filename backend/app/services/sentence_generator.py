@@ -1,30 +1,33 @@
 from typing import List, Dict
-from app.services.paraphraser import get_paraphraser
+from app.services.paraphrase_cache import get_paraphrase_cache
+from app.services.temporal_aggregator import SignSequenceAggregator, WordSegment
 
 def generate_sentence_from_detections(detections: List[Dict]) -> str:
     if not detections:
         return ""
     
-    words = _extract_unique_words(detections)
+    if _is_frame_based_detections(detections):
+        words = _extract_sequence_words(detections)
+    else:
+        words = _get_words_from_detections(detections, set())
+    
+    return generate_sentence_from_words(words)
+
+def generate_sentence_from_segments(segments: List[WordSegment]) -> str:
+    return generate_sentence_from_words([segment.word for segment in segments])
+
+def generate_sentence_from_words(words: List[str]) -> str:
     if not words:
         return ""
         
-    detected_text = " ".join(words)
-    paraphraser = get_paraphraser()
-    return paraphraser.paraphrase(detected_text)
+    return get_paraphrase_cache().paraphrase(words)
 
-def _extract_unique_words(detections: List[Dict]) -> List[str]:
-    seen_words = set()
-    words = []
-    
-    if _is_frame_based_detections(detections):
-        for frame in detections:
-            frame_detections = frame.get("detections", [])
-            words.extend(_get_words_from_detections(frame_detections, seen_words))
-    else:
-        words.extend(_get_words_from_detections(detections, seen_words))
-    
-    return words
+def _extract_sequence_words(frames: List[Dict]) -> List[str]:
+    aggregator = SignSequenceAggregator()
+    for frame in frames:
+        aggregator.push(frame["frame_number"], frame.get("timestamp", 0.0), frame.get("detections", []))
+    aggregator.flush()
+    return aggregator.words()
 
 def _is_frame_based_detections(detections: List[Dict]) -> bool:
     return (detections and 
@@ -0,0 +1,127 @@
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.core.config import SIGN_WINDOW_SIZE, SIGN_ENTER_SCORE, SIGN_EXIT_SCORE, SIGN_MIN_DURATION
+
+
+class WordSegment:
+    __slots__ = ("word", "start_frame", "end_frame", "start_time", "end_time", "_confidence_sum", "_frames")
+
+    def __init__(self, word: str, start_frame: int, start_time: float):
+        self.word = word
+        self.start_frame = self.end_frame = start_frame
+        self.start_time = self.end_time = start_time
+        self._confidence_sum = 0.0
+        self._frames = 0
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    @property
+    def confidence(self) -> float:
+        return self._confidence_sum / self._frames if self._frames else 0.0
+
+    def extend(self, frame_number: int, timestamp: float, confidence: float) -> None:
+        self.end_frame = frame_number
+        self.end_time = timestamp
+        self._confidence_sum += confidence
+        self._frames += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "word": self.word,
+            "start_frame": self.start_frame,
+            "end_frame": self.end_frame,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "confidence": round(self.confidence, 4)
+        }
+
+
+class SignSequenceAggregator:
+    """
+    Sliding-window, confidence-weighted voting with enter/exit hysteresis.
+    Emits a WordSegment once a word has ended and lasted at least min_duration.
+    """
+
+    def __init__(self, window_size: int = SIGN_WINDOW_SIZE, enter_score: float = SIGN_ENTER_SCORE,
+                 exit_score: float = SIGN_EXIT_SCORE, min_duration: float = SIGN_MIN_DURATION):
+        self.window_size = max(1, window_size)
+        self.enter_score = enter_score
+        self.exit_score = min(exit_score, enter_score)
+        self.min_duration = min_duration
+        self.segments: List[WordSegment] = []
+        self._window = deque()
+        self._scores: Dict[str, float] = {}
+        self._active: Optional[WordSegment] = None
+
+    @property
+    def active_word(self) -> Optional[str]:
+        return self._active.word if self._active else None
+
+    def push(self, frame_number: int, timestamp: float, detections: List[Dict]) -> List[WordSegment]:
+        word, confidence = self._top_detection(detections)
+        self._vote(frame_number, timestamp, word, confidence)
+
+        closed = []
+        if self._active is not None:
+            active_score = self._score(self._active.word)
+            if active_score < self.exit_score or (word is not None and word != self._active.word
+                                                    and self._score(word) >= self.enter_score
+                                                    and self._score(word) > active_score):
+                closed.extend(self._close_active())
+            elif word == self._active.word:
+                self._active.extend(frame_number, timestamp, confidence)
+
+        if self._active is None and word is not None and self._score(word) >= self.enter_score:
+            self._open(word)
+
+        return closed
+
+    def flush(self) -> List[WordSegment]:
+        closed = self._close_active()
+        self._window.clear()
+        self._scores.clear()
+        return closed
+
+    def words(self) -> List[str]:
+        return [segment.word for segment in self.segments]
+
+    def _vote(self, frame_number: int, timestamp: float, word: Optional[str], confidence: float) -> None:
+        self._window.append((frame_number, timestamp, word, confidence))
+        if word is not None:
+            self._scores[word] = self._scores.get(word, 0.0) + confidence
+
+        if len(self._window) > self.window_size:
+            _, _, old_word, old_confidence = self._window.popleft()
+            if old_word is not None:
+                remaining = self._scores[old_word] - old_confidence
+                if remaining <= 1e-9:
+                    del self._scores[old_word]
+                else:
+                    self._scores[old_word] = remaining
+
+    def _score(self, word: str) -> float:
+        return self._scores.get(word, 0.0) / self.window_size
+
+    def _open(self, word: str) -> None:
+        votes = [entry for entry in self._window if entry[2] == word]
+        frame_number, timestamp, _, _ = votes[0]
+        self._active = WordSegment(word, frame_number, timestamp)
+        for frame_number, timestamp, _, confidence in votes:
+            self._active.extend(frame_number, timestamp, confidence)
+
+    def _close_active(self) -> List[WordSegment]:
+        segment, self._active = self._active, None
+        if segment is None or segment.duration < self.min_duration:
+            return []
+        self.segments.append(segment)
+        return [segment]
+
+    @staticmethod
+    def _top_detection(detections: List[Dict]):
+        best = max(detections, key=lambda det: det.get("confidence", 0.0), default=None)
+        if best is None or not best.get("class_name"):
+            return None, 0.0
+        return best["class_name"].strip().lower(), float(best.get("confidence", 0.0))
@@ -0,0 +1,232 @@
+import cv2
+import queue
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import MAX_VIDEO_FRAMES, VIDEO_BATCH_SIZE, VIDEO_PIPELINE_QUEUE_SIZE
+from app.services.metrics import STAGE_DURATION, get_metrics
+from app.services.motion_gate import MotionGate
+from app.services.roi_tracker import RoiTracker
+from app.services.temporal_aggregator import SignSequenceAggregator
+from app.utils.video_utils import create_video_writer
+
+_END_OF_STREAM = object()
+
+
+class StageTimer:
+    def __init__(self):
+        self.frames = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float, frames: int = 1) -> None:
+        self.seconds += seconds
+        self.frames += frames
+
+    def to_dict(self) -> Dict:
+        return {
+            "frames": self.frames,
+            "seconds": round(self.seconds, 4),
+            "ms_per_frame": round(1000 * self.seconds / self.frames, 3) if self.frames else 0.0
+        }
+
+
+class VideoPipeline:
+    """
+    Three-stage video engine: decode -> batched inference -> annotate/encode.
+
+    Each stage runs on its own thread and hands work to the next through a
+    bounded queue, so a slow stage applies back-pressure instead of letting
+    decoded frames pile up in memory. OpenCV and the inference runtime both
+    release the GIL, which lets the stages overlap on multi-core hosts.
+
+    When a motion gate is given, the decode stage marks near-static frames
+    and the inference stage reuses the previous detections for them. When an
+    aggregator is given, the annotate stage feeds it every frame in order.
+    When an ROI tracker is given, inferred frames go through its
+    detect-then-track cascade instead of full-frame detection.
+    """
+
+    def __init__(self, detector, batch_size: int = VIDEO_BATCH_SIZE, queue_size: int = VIDEO_PIPELINE_QUEUE_SIZE, motion_gate: Optional[MotionGate] = None,
+                 aggregator: Optional[SignSequenceAggregator] = None, input_size: int = 640, conf_threshold: Optional[float] = None,
+                 roi_tracker: Optional[RoiTracker] = None):
+        self.detector = detector
+        self.batch_size = max(1, batch_size)
+        self.input_size = input_size
+        self.conf_threshold = conf_threshold
+        self.queue_size = max(1, queue_size)
+        self.motion_gate = motion_gate
+        self.aggregator = aggregator
+        self.roi_tracker = roi_tracker
+        self.stage_timings = {}
+
+    def run(self, video_path: str, max_frames: int = MAX_VIDEO_FRAMES, output_path: Optional[Path] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None, start_frame: int = 0) -> Tuple[List[Dict], float]:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video file: {video_path}")
+        if start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - start_frame
+        self._frames_total = min(frame_count, max_frames) if frame_count > 0 else max_frames
+        self._start_frame = start_frame
+        self._progress_callback = progress_callback
+        self._stop_event = threading.Event()
+        self._errors = []
+        self._frame_detections = []
+        self._timers = {"decode": StageTimer(), "inference": StageTimer(), "annotate": StageTimer()}
+
+        decoded = queue.Queue(maxsize=self.queue_size)
+        inferred = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            threading.Thread(target=self._run_stage, args=(self._decode, cap, max_frames, decoded), name="video-decode", daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._infer, decoded, inferred), name="video-inference", daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._annotate, inferred, fps, output_path), name="video-annotate", daemon=True),
+        ]
+
+        start_time = perf_counter()
+        try:
+            for stage in stages:
+                stage.start()
+            for stage in stages:
+                stage.join()
+        finally:
+            cap.release()
+
+        self.stage_timings = {name: timer.to_dict() for name, timer in self._timers.items()}
+        self.stage_timings["total_seconds"] = round(perf_counter() - start_time, 4)
+        self.stage_timings["frames_inferred"] = sum(1 for frame in self._frame_detections if frame["inferred"])
+        if self.roi_tracker is not None:
+            self.stage_timings["roi_tracker"] = self.roi_tracker.get_stats()
+
+        if self._errors:
+            raise self._errors[0]
+
+        return self._frame_detections, fps
+
+    def _run_stage(self, stage, *args) -> None:
+        try:
+            stage(*args)
+        except Exception as e:
+            self._errors.append(e)
+            self._stop_event.set()
+
+    def _decode(self, cap: cv2.VideoCapture, max_frames: int, output: queue.Queue) -> None:
+        timer = self._timers["decode"]
+        histogram = get_metrics().histogram(STAGE_DURATION, stage="video_decode")
+        frame_number = self._start_frame
+
+        while frame_number < self._start_frame + max_frames and not self._stop_event.is_set():
+            start = perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            decoded_at = perf_counter()
+            infer = self.motion_gate is None or self.motion_gate.should_infer(frame)
+            timer.add(perf_counter() - start)
+            histogram.observe(decoded_at - start)
+
+            if not self._put(output, (frame_number, frame, infer)):
+                return
+            frame_number += 1
+
+        self._put(output, _END_OF_STREAM)
+
+    def _infer(self, source: queue.Queue, output: queue.Queue) -> None:
+        timer = self._timers["inference"]
+        end_of_stream = False
+        last_detections = []
+
+        while not end_of_stream:
+            batch = []
+            while len(batch) < self.batch_size:
+                item = self._get(source)
+                if item is _END_OF_STREAM:
+                    end_of_stream = True
+                    break
+                batch.append(item)
+
+            if not batch:
+                break
+
+            inferred_frames = [frame for _, frame, infer in batch if infer]
+            start = perf_counter()
+            inferred_detections = iter(self._detect(inferred_frames) if inferred_frames else [])
+            timer.add(perf_counter() - start, len(inferred_frames))
+
+            for frame_number, frame, infer in batch:
+                if infer:
+                    last_detections = next(inferred_detections)
+                if not self._put(output, (frame_number, frame, last_detections, infer)):
+                    return
+
+        self._put(output, _END_OF_STREAM)
+
+    def _detect(self, frames: List) -> List[List[Dict]]:
+        if self.roi_tracker is not None:
+            return self.roi_tracker.detect_batch(self.detector, frames, conf_threshold=self.conf_threshold)
+        return self.detector.detect_batch(frames, batch_size=len(frames), input_size=self.input_size, conf_threshold=self.conf_threshold)
+
+    def _annotate(self, source: queue.Queue, fps: float, output_path: Optional[Path]) -> None:
+        timer = self._timers["annotate"]
+        histogram = get_metrics().histogram(STAGE_DURATION, stage="video_encode")
+        writer = None
+
+        try:
+            while True:
+                item = self._get(source)
+                if item is _END_OF_STREAM:
+                    break
+
+                frame_number, frame, detections, inferred = item
+                start = perf_counter()
+
+                if output_path is not None:
+                    if writer is None:
+                        h, w = frame.shape[:2]
+                        writer = create_video_writer(output_path, fps, (w, h))
+                    annotated = self.detector._draw_detections(frame, detections)
+                    encode_start = perf_counter()
+                    writer.write(annotated)
+                    histogram.observe(perf_counter() - encode_start)
+
+                timestamp = frame_number / fps
+                if self.aggregator is not None:
+                    self.aggregator.push(frame_number, timestamp, detections)
+
+                self._frame_detections.append({
+                    "frame_number": frame_number,
+                    "timestamp": timestamp,
+                    "detections": detections,
+                    "inferred": inferred
+                })
+                timer.add(perf_counter() - start)
+
+                if self._progress_callback is not None:
+                    self._progress_callback(len(self._frame_detections), self._frames_total)
+            if self.aggregator is not None:
+                self.aggregator.flush()
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue):
+        while not self._stop_event.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END_OF_STREAM
@@ -1,29 +1,26 @@
-import moviepy.editor as moviepy
 from pathlib import Path
-from typing import Tuple, List, Dict
-from fastapi import HTTPException, status
+from typing import Callable, Tuple, List, Dict, Optional
 
-from app.services.detector import get_detector
+from app.core.config import VIDEO_SEGMENT_WORKERS
+from app.services.model_registry import get_model_registry
+from app.services.temporal_aggregator import SignSequenceAggregator
+from app.services.video_segments import get_video_segment_processor
 
-async def convert_avi_to_mp4(input_path: Path, output_path: Path) -> None:
-    try:
-        clip = moviepy.VideoFileClip(str(input_path))
-        clip.write_videofile(str(output_path), codec="libx264", audio_codec="aac")
-        clip.close()
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error converting video: {str(e)}"
-        )
-
-def process_video_frame_by_frame(video_path: Path) -> Tuple[List[Dict], float]:
-    detector = get_detector()
-    return detector.process_video_frames(str(video_path))
-
-async def stream_video_file(file_path: Path, chunk_size: int = 1024 * 1024):
-    with open(file_path, 'rb') as video_file:
-        while True:
-            chunk = video_file.read(chunk_size)
-            if not chunk:
-                break
-            yield chunk
+def process_video_frame_by_frame(video_path: Path, output_path: Optional[Path] = None,
+                                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                                 aggregator: Optional[SignSequenceAggregator] = None,
+                                 model: Optional[str] = None) -> Tuple[List[Dict], float]:
+    registry = get_model_registry()
+    variant = registry.variant(model)
+    
+    if VIDEO_SEGMENT_WORKERS > 0:
+        processor = get_video_segment_processor()
+        segments = processor.plan(video_path)
+        if len(segments) > 1:
+            return processor.process(video_path, segments, variant, output_path=output_path,
+                                     progress_callback=progress_callback, aggregator=aggregator)
+    
+    detector = registry.get_detector(variant.name)
+    return detector.process_video_frames(str(video_path), output_path=output_path, progress_callback=progress_callback,
+                                         aggregator=aggregator, input_size=variant.input_size,
+                                         conf_threshold=variant.conf_threshold)
@@ -0,0 +1,178 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+
+from app.core.config import (
+    INFERENCE_WORKER_MAX_MODELS, MAX_VIDEO_FRAMES, ROI_TRACKING, VIDEO_BATCH_SIZE, VIDEO_SEGMENT_MIN_FRAMES, VIDEO_SEGMENT_WORKERS
+)
+from app.services.metrics import time_stage
+from app.services.model_registry import DetectorCache, ModelVariant
+from app.services.motion_gate import MotionGate
+from app.services.roi_tracker import RoiTracker
+from app.services.temporal_aggregator import SignSequenceAggregator
+from app.services.video_pipeline import VideoPipeline
+from app.utils.file_utils import safe_remove_file
+from app.utils.video_utils import create_video_writer
+
+Segment = Tuple[int, int]
+
+_segment_detectors: Optional[DetectorCache] = None
+
+
+def _process_segment(video_path: str, start_frame: int, frame_count: int, output_path: Optional[Path], model_path: str, backend: str,
+                     input_size: int, conf_threshold: float, batch_size: int, roi_tracking: bool) -> List[Dict]:
+    global _segment_detectors
+    if _segment_detectors is None:
+        _segment_detectors = DetectorCache(INFERENCE_WORKER_MAX_MODELS)
+
+    detector = _segment_detectors.get(model_path, backend)
+    pipeline = VideoPipeline(detector, batch_size=batch_size, motion_gate=MotionGate(), input_size=input_size, conf_threshold=conf_threshold,
+                             roi_tracker=RoiTracker(input_size) if roi_tracking else None)
+    frame_detections, _ = pipeline.run(video_path, max_frames=frame_count, output_path=output_path, start_frame=start_frame)
+    return frame_detections
+
+
+def plan_segments(frame_count: int, num_segments: int, min_frames: int) -> List[Segment]:
+    num_segments = max(1, min(num_segments, frame_count // max(1, min_frames)))
+    size = -(-frame_count // num_segments) if frame_count > 0 else 0
+    return [(start, min(size, frame_count - start)) for start in range(0, frame_count, size)] if size else [(0, frame_count)]
+
+
+class VideoSegmentProcessor:
+    """
+    Splits a video into contiguous frame ranges and runs each range through
+    its own VideoPipeline in a worker process, so a long video is decoded
+    and inferred on several cores instead of one.
+
+    Each segment seeks to its first frame and numbers frames from there, so
+    the merged detections carry global frame numbers and timestamps. The
+    aggregator is fed the merged frames in order after all segments finish,
+    and the annotated segments are stitched into one output file. Progress
+    is reported as segments complete.
+    """
+
+    def __init__(self, num_workers: int = VIDEO_SEGMENT_WORKERS, min_segment_frames: int = VIDEO_SEGMENT_MIN_FRAMES):
+        self.num_workers = max(1, num_workers)
+        self.min_segment_frames = max(1, min_segment_frames)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def plan(self, video_path: Path, max_frames: int = MAX_VIDEO_FRAMES) -> List[Segment]:
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video file: {video_path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        return plan_segments(min(max(frame_count, 0), max_frames), self.num_workers, self.min_segment_frames)
+
+    def process(self, video_path: Path, segments: List[Segment], variant: ModelVariant, max_frames: int = MAX_VIDEO_FRAMES,
+                output_path: Optional[Path] = None, progress_callback: Optional[Callable[[int, int], None]] = None,
+                aggregator: Optional[SignSequenceAggregator] = None) -> Tuple[List[Dict], float]:
+        cap = cv2.VideoCapture(str(video_path))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+
+        part_paths = [
+            output_path.with_name(f"{output_path.stem}.part{index}{output_path.suffix}") if output_path is not None else None
+            for index in range(len(segments))
+        ]
+        frames_total = sum(count for _, count in segments)
+        # The container's frame count is only an estimate, so the last segment reads on until the end of the video
+        segments = segments[:-1] + [(segments[-1][0], max_frames - segments[-1][0])]
+        results: List[Optional[List[Dict]]] = [None] * len(segments)
+
+        try:
+            executor = self._get_executor()
+            futures = {
+                executor.submit(_process_segment, str(video_path), start, count, part_path, variant.path, variant.backend,
+                                variant.input_size, variant.conf_threshold, VIDEO_BATCH_SIZE, ROI_TRACKING): index
+                for index, ((start, count), part_path) in enumerate(zip(segments, part_paths))
+            }
+            frames_done = 0
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    frames_done += len(results[index])
+                    if progress_callback is not None:
+                        progress_callback(frames_done, max(frames_total, frames_done))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+            frame_detections = [frame for detections in results for frame in detections]
+            if aggregator is not None:
+                for frame in frame_detections:
+                    aggregator.push(frame["frame_number"], frame["timestamp"], frame["detections"])
+                aggregator.flush()
+
+            if output_path is not None:
+                with time_stage("video_stitch"):
+                    self._stitch(part_paths, output_path, fps)
+        except BrokenProcessPool as e:
+            self._reset_executor()
+            raise RuntimeError(f"A video segment worker exited unexpectedly: {e}")
+        finally:
+            for part_path in part_paths:
+                if part_path is not None:
+                    safe_remove_file(part_path)
+
+        return frame_detections, fps
+
+    def stop(self) -> None:
+        self._reset_executor()
+
+    def _stitch(self, part_paths: List[Path], output_path: Path, fps: float) -> None:
+        writer = None
+        try:
+            for part_path in part_paths:
+                cap = cv2.VideoCapture(str(part_path))
+                while True:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    if writer is None:
+                        h, w = frame.shape[:2]
+                        writer = create_video_writer(output_path, fps, (w, h))
+                    writer.write(frame)
+                cap.release()
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.num_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_segment_processor_instance: Optional[VideoSegmentProcessor] = None
+_segment_processor_lock = threading.Lock()
+
+def get_video_segment_processor() -> VideoSegmentProcessor:
+    global _segment_processor_instance
+    if _segment_processor_instance is None:
+        with _segment_processor_lock:
+            if _segment_processor_instance is None:
+                _segment_processor_instance = VideoSegmentProcessor()
+    return _segment_processor_instance
+
+def shutdown_video_segment_processor():
+    global _segment_processor_instance
+    if _segment_processor_instance is not None:
+        _segment_processor_instance.stop()
+        _segment_processor_instance = None
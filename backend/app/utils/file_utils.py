@@ -3,7 +3,7 @@ import shutil
 import os
 from typing import Set
 
-from app.core.config import PREDICTION_DIR
+from app.core.config import JOBS_DIR
 
 
 def get_file_extension(filename: str) -> str:
@@ -18,14 +18,21 @@ def is_video_file(filename: str, video_extensions: Set[str]) -> bool:
 def is_image_file(filename: str, image_extensions: Set[str]) -> bool:
     return get_file_extension(filename) in image_extensions
 
-def cleanup_runs_directory() -> None:
-    if PREDICTION_DIR.exists():
+def cleanup_jobs_directory() -> None:
+    if JOBS_DIR.exists():
         try:
-            shutil.rmtree(PREDICTION_DIR.parent.parent)
-            print(f"Successfully cleaned up {PREDICTION_DIR.parent.parent}")
+            shutil.rmtree(JOBS_DIR)
+            print(f"Successfully cleaned up {JOBS_DIR}")
         except Exception as e:
             print(f"Error cleaning up directory: {e}")
 
+def remove_directory(directory: Path) -> None:
+    try:
+        if directory.exists():
+            shutil.rmtree(directory)
+    except Exception as e:
+        print(f"Error removing directory {directory}: {e}")
+
 def safe_remove_file(file_path: Path) -> None:
     try:
         if file_path.exists():
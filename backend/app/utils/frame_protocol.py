@@ -0,0 +1,75 @@
+import json
+import struct
+from typing import Dict, Optional
+
+# Binary sub-protocol for /v1/detections/stream.
+#
+# Client -> server (little endian, 14 byte header followed by raw JPEG bytes):
+#   magic b"VS" | version u8 | flags u8 | skip_frames u16 | timestamp f64
+#   flags: bit 0 = return_image, bit 1 = skip_frames is set, bit 2 = captions
+#
+# Server -> client (little endian, 16 byte header, JSON metadata, then raw JPEG bytes):
+#   magic b"VS" | version u8 | flags u8 | timestamp f64 | metadata length u32
+#   flags: bit 0 = skipped, bit 1 = image attached
+#
+# The metadata holds every reply field except the image. Errors are still sent as JSON text.
+# Version 2 dropped the unused resize_factor field from the request header.
+
+PROTOCOL_MAGIC = b"VS"
+PROTOCOL_VERSION = 2
+
+FLAG_RETURN_IMAGE = 1 << 0
+FLAG_HAS_SETTINGS = 1 << 1
+FLAG_CAPTIONS = 1 << 2
+
+FLAG_SKIPPED = 1 << 0
+FLAG_HAS_IMAGE = 1 << 1
+
+_REQUEST_HEADER = struct.Struct("<2sBBHd")
+_REPLY_HEADER = struct.Struct("<2sBBdI")
+
+
+class FrameProtocolError(ValueError):
+    pass
+
+
+def decode_frame_message(payload: bytes) -> Dict:
+    if len(payload) < _REQUEST_HEADER.size:
+        raise FrameProtocolError("Binary frame is shorter than the protocol header")
+
+    magic, version, flags, skip_frames, timestamp = _REQUEST_HEADER.unpack_from(payload)
+    if magic != PROTOCOL_MAGIC or version != PROTOCOL_VERSION:
+        raise FrameProtocolError("Unsupported binary frame protocol")
+
+    message = {
+        "timestamp": timestamp,
+        "return_image": bool(flags & FLAG_RETURN_IMAGE),
+        "captions": bool(flags & FLAG_CAPTIONS),
+        "image": memoryview(payload)[_REQUEST_HEADER.size:]
+    }
+    if flags & FLAG_HAS_SETTINGS:
+        message["skip_frames"] = skip_frames
+    return message
+
+
+def encode_reply_message(response: Dict, image: Optional[bytes] = None) -> bytes:
+    flags = 0
+    if response.get("skipped"):
+        flags |= FLAG_SKIPPED
+    if image is not None:
+        flags |= FLAG_HAS_IMAGE
+
+    metadata = json.dumps(
+        {key: value for key, value in response.items() if key != "image"},
+        separators=(",", ":"),
+        ensure_ascii=False
+    ).encode("utf-8")
+    timestamp = response.get("timestamp")
+    header = _REPLY_HEADER.pack(
+        PROTOCOL_MAGIC,
+        PROTOCOL_VERSION,
+        flags,
+        float(timestamp) if timestamp is not None else 0.0,
+        len(metadata)
+    )
+    return b"".join((header, metadata, image or b""))
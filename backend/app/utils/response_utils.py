@@ -0,0 +1,50 @@
+from email.utils import formatdate, parsedate_to_datetime
+from hashlib import md5
+from pathlib import Path
+
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.core.config import ALLOWED_VIDEO_EXTENSIONS, RESULT_CACHE_CONTROL
+from app.utils.file_utils import get_file_extension
+
+
+def build_file_response(request: Request, file_path: Path) -> Response:
+    """
+    Serve a result file with HTTP caching and byte-range support.
+
+    Conditional requests are answered with 304 when the ETag or
+    Last-Modified still matches. Everything else goes through FileResponse,
+    which handles Range requests (206 / 416), reads the file off the event
+    loop and uses zero-copy sending when the server supports it.
+    """
+    stat_result = file_path.stat()
+    etag = f'"{md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode(), usedforsecurity=False).hexdigest()}"'
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {
+        "Content-Disposition": f"inline; filename={file_path.name}",
+        "Cache-Control": RESULT_CACHE_CONTROL,
+        "ETag": etag,
+        "Last-Modified": last_modified
+    }
+
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = "video/mp4" if get_file_extension(file_path.name) in ALLOWED_VIDEO_EXTENSIONS else "image/jpeg"
+    return FileResponse(path=file_path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
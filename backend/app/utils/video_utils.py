@@ -0,0 +1,18 @@
+import cv2
+from pathlib import Path
+from typing import Tuple
+
+from app.core.config import VIDEO_FOURCC_CANDIDATES
+
+
+def create_video_writer(output_path: Path, fps: float, frame_size: Tuple[int, int]) -> cv2.VideoWriter:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fps = fps if fps and fps > 0 else 30.0
+
+    for codec in VIDEO_FOURCC_CANDIDATES:
+        writer = cv2.VideoWriter(str(output_path), cv2.VideoWriter_fourcc(*codec), fps, frame_size)
+        if writer.isOpened():
+            return writer
+        writer.release()
+
+    raise RuntimeError(f"Could not open a video writer for {output_path}")
@@ -0,0 +1,318 @@
+"""
+Offline benchmark for the detection hot paths.
+
+Times frame decoding, detection, annotation, JPEG encoding, sentence
+generation and the full video pipeline on synthetic frames and a synthetic
+video. Detection runs either on a tiny generated ONNX model (needs the
+`onnx` package to build it) or on a stub detector, and paraphrasing uses a
+stub, so no network, GPU or trained model is needed.
+
+Results are written as JSON. When a baseline file exists, every stage's
+median latency is compared against it and the script exits with status 1
+if any stage got slower than the allowed threshold.
+
+Usage (from the backend directory):
+    python scripts/benchmark.py [--detector auto|onnx|stub] [--iterations 200]
+    python scripts/benchmark.py --save-baseline
+"""
+import argparse
+import base64
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.services.sentence_generator as sentence_generator
+from app.api.routes.websocket import RealtimeDetectionHandler
+from app.services.detector import SignLanguageDetector
+from app.services.motion_gate import MotionGate
+from app.services.paraphrase_cache import ParaphraseCache
+from app.services.renderer import get_annotation_renderer
+from app.services.video_pipeline import VideoPipeline
+
+CLASS_NAMES = ["xin chào", "tôi", "tên", "cảm ơn"]
+DEFAULT_OUTPUT = Path("runs/benchmarks/results.json")
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+
+class StubDetector(SignLanguageDetector):
+    def _load_and_optimize_model(self):
+        self.names = dict(enumerate(CLASS_NAMES))
+        return None
+
+    def detect_batch(self, frames: List[np.ndarray], batch_size: int = 8, input_size: int = 640, conf_threshold: Optional[float] = None) -> List[List[Dict]]:
+        detections = []
+        for frame in frames:
+            thumbnail = cv2.resize(frame, (input_size, input_size))
+            level = float(thumbnail.mean()) / 255.0
+            h, w = frame.shape[:2]
+            detections.append([{
+                "class_name": CLASS_NAMES[int(level * 97) % len(CLASS_NAMES)],
+                "confidence": 0.8 + 0.2 * level,
+                "bbox": [w * 0.25, h * 0.25, w * 0.75, h * 0.75]
+            }])
+        return detections
+
+
+def build_tiny_onnx_model(path: Path) -> None:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    num_outputs = 4 + len(CLASS_NAMES)
+    rng = np.random.RandomState(0)
+    weights = (rng.randn(num_outputs, 3, 32, 32) * 0.01).astype(np.float32)
+    bias = np.array([320, 320, 120, 120] + [0.9] + [0.1] * (len(CLASS_NAMES) - 1), dtype=np.float32)
+
+    graph = helper.make_graph(
+        [
+            helper.make_node("Conv", ["images", "W", "B"], ["features"], kernel_shape=[32, 32], strides=[32, 32]),
+            helper.make_node("Reshape", ["features", "shape"], ["output0"]),
+        ],
+        "tiny_yolo",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, ["batch", 3, 640, 640])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, ["batch", num_outputs, 400])],
+        [
+            numpy_helper.from_array(weights, "W"),
+            numpy_helper.from_array(bias, "B"),
+            numpy_helper.from_array(np.array([0, num_outputs, -1], dtype=np.int64), "shape"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    model.metadata_props.add(key="names", value=repr(dict(enumerate(CLASS_NAMES))))
+    onnx.save(model, str(path))
+
+
+def create_benchmark_detector(kind: str, work_dir: Path):
+    if kind in ("auto", "onnx"):
+        try:
+            from app.services.onnx_detector import OnnxSignLanguageDetector
+
+            model_path = work_dir / "tiny.onnx"
+            build_tiny_onnx_model(model_path)
+            return OnnxSignLanguageDetector(str(model_path), conf_threshold=0.5), "onnx"
+        except ImportError as e:
+            if kind == "onnx":
+                raise
+            print(f"ONNX model unavailable ({e}), using the stub detector")
+    return StubDetector("stub", conf_threshold=0.5), "stub"
+
+
+def synthetic_frames(count: int, width: int, height: int) -> List[np.ndarray]:
+    rng = np.random.RandomState(0)
+    background = np.tile(np.linspace(40, 200, width, dtype=np.uint8), (height, 1))
+    background = cv2.merge([background, background[::-1], np.full_like(background, 90)])
+    frames = []
+    for index in range(count):
+        frame = background.copy()
+        x = int((width - 120) * (0.5 + 0.5 * np.sin(index / 10)))
+        y = int((height - 160) * (0.5 + 0.5 * np.cos(index / 15)))
+        cv2.rectangle(frame, (x, y), (x + 120, y + 160), (60, 140, 220), -1)
+        frame = cv2.add(frame, rng.randint(0, 12, frame.shape, dtype=np.uint8))
+        frames.append(frame)
+    return frames
+
+
+def write_synthetic_video(path: Path, frames: List[np.ndarray], fps: float = 30.0) -> None:
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def summarize(samples_ms: List[float], frames_per_sample: int = 1) -> Dict:
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    mean_ms = float(samples.mean())
+    return {
+        "count": len(samples),
+        "mean_ms": round(mean_ms, 4),
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p90_ms": round(float(np.percentile(samples, 90)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "max_ms": round(float(samples.max()), 4),
+        "fps": round(1000 * frames_per_sample / mean_ms, 2) if mean_ms > 0 else 0.0
+    }
+
+
+def time_stage(fn: Callable[[int], None], iterations: int, warmup: int, setup: Optional[Callable[[int], object]] = None) -> List[float]:
+    samples = []
+    for index in range(warmup + iterations):
+        arg = setup(index) if setup is not None else index
+        start = perf_counter()
+        fn(arg)
+        elapsed = (perf_counter() - start) * 1000
+        if index >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def stub_paraphrase(text: str) -> str:
+    return text.capitalize() + "."
+
+
+def synthetic_frame_detections(count: int, fps: float = 30.0) -> List[Dict]:
+    frames = []
+    for index in range(count):
+        word = CLASS_NAMES[(index // 20) % len(CLASS_NAMES)]
+        detections = [] if index % 20 >= 16 else [{"class_name": word, "confidence": 0.9, "bbox": [10, 10, 100, 100]}]
+        frames.append({"frame_number": index, "timestamp": index / fps, "detections": detections})
+    return frames
+
+
+def run_benchmarks(args) -> Dict:
+    width, height = args.frame_size
+    work_dir = Path(tempfile.mkdtemp(prefix="vsl-benchmark-"))
+    detector, detector_kind = create_benchmark_detector(args.detector, work_dir)
+
+    frames = synthetic_frames(args.video_frames, width, height)
+    jpegs = [cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes() for frame in frames]
+    data_urls = ["data:image/jpeg;base64," + base64.b64encode(jpeg).decode() for jpeg in jpegs]
+    pick = lambda index: index % len(frames)
+
+    handler = RealtimeDetectionHandler()
+    renderer = get_annotation_renderer()
+    sample_detections = detector.detect(frames[0])
+    stages = {}
+
+    stages["decode_jpeg"] = summarize(time_stage(
+        lambda i: handler.decode_frame(jpegs[pick(i)]), args.iterations, args.warmup))
+    stages["decode_data_url"] = summarize(time_stage(
+        lambda i: handler.decode_frame(data_urls[pick(i)]), args.iterations, args.warmup))
+    stages["detect"] = summarize(time_stage(
+        lambda i: detector.detect(frames[pick(i)]), args.iterations, args.warmup))
+    stages["detect_from_image"] = summarize(time_stage(
+        lambda frame: detector.detect_from_image(frame), args.iterations, args.warmup,
+        setup=lambda i: frames[pick(i)].copy()))
+    stages["annotate"] = summarize(time_stage(
+        lambda frame: renderer.draw(frame, sample_detections), args.iterations, args.warmup,
+        setup=lambda i: frames[pick(i)].copy()))
+    stages["encode_jpeg"] = summarize(time_stage(
+        lambda i: cv2.imencode(".jpg", frames[pick(i)], [cv2.IMWRITE_JPEG_QUALITY, 80]), args.iterations, args.warmup))
+
+    clip = synthetic_frame_detections(args.video_frames)
+    sentence_generator.get_paraphrase_cache = lambda: ParaphraseCache(stub_paraphrase, db_path=None)
+    stages["generate_sentence"] = summarize(time_stage(
+        lambda i: sentence_generator.generate_sentence_from_detections(clip), args.iterations, args.warmup))
+
+    video_path = work_dir / "synthetic.mp4"
+    write_synthetic_video(video_path, frames)
+    video_samples, stage_samples = [], {}
+    for run in range(args.video_warmup + args.video_runs):
+        pipeline = VideoPipeline(detector, motion_gate=MotionGate())
+        start = perf_counter()
+        frame_detections, _ = pipeline.run(str(video_path), output_path=work_dir / f"annotated_{run}.mp4")
+        elapsed = (perf_counter() - start) * 1000
+        if run < args.video_warmup:
+            continue
+        video_samples.append(elapsed)
+        for name in ("decode", "inference", "annotate"):
+            stage_samples.setdefault(name, []).append(pipeline.stage_timings[name]["ms_per_frame"])
+
+    stages["video_pipeline"] = summarize(video_samples, frames_per_sample=len(frame_detections))
+    for name, samples in stage_samples.items():
+        stages[f"video_{name}_per_frame"] = summarize(samples)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "detector": detector_kind,
+            "frame_size": [width, height],
+            "iterations": args.iterations,
+            "video_frames": args.video_frames,
+            "video_runs": args.video_runs
+        },
+        "stages": stages
+    }
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    if baseline.get("meta", {}).get("detector") != results["meta"]["detector"]:
+        print(f"Baseline was recorded with the {baseline.get('meta', {}).get('detector')} detector, "
+              f"current run uses {results['meta']['detector']}")
+
+    regressions = []
+    print(f"\n{'stage':<28} {'baseline p50':>13} {'current p50':>12} {'change':>8}")
+    for name, current in results["stages"].items():
+        reference = baseline.get("stages", {}).get(name)
+        if reference is None:
+            print(f"{name:<28} {'-':>13} {current['p50_ms']:>12.3f} {'new':>8}")
+            continue
+
+        before, after = reference["p50_ms"], current["p50_ms"]
+        change = (after - before) / before if before > 0 else 0.0
+        regressed = change > threshold and after - before > min_delta_ms
+        print(f"{name:<28} {before:>13.3f} {after:>12.3f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: Dict) -> None:
+    print(f"Detector: {results['meta']['detector']}, frame size: {results['meta']['frame_size']}")
+    print(f"{'stage':<28} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'fps':>10}")
+    for name, stats in results["stages"].items():
+        print(f"{name:<28} {stats['p50_ms']:>9.3f} {stats['p90_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['fps']:>10.1f}")
+
+
+def parse_frame_size(value: str):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--detector", choices=["auto", "onnx", "stub"], default="auto")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--frame-size", type=parse_frame_size, default=(640, 480), help="WIDTHxHEIGHT")
+    parser.add_argument("--video-frames", type=int, default=120)
+    parser.add_argument("--video-runs", type=int, default=3)
+    parser.add_argument("--video-warmup", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative p50 slowdown per stage")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    print_results(results)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare_with_baseline(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\nRegressed stages: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Compare the int8 quantized paraphraser against the fp32 model.
+
+Runs both variants over a fixed phrase set, reports latency and memory of
+each and lists every phrase whose output differs. Exits with status 1 when
+the share of identical outputs is below --min-match.
+
+Usage (from the backend directory):
+    python scripts/compare_paraphraser.py [--min-match 1.0] [--batch-size 8]
+"""
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.paraphraser import Paraphraser
+
+PHRASES = [
+    "xin chào tôi tên là",
+    "tôi là sinh viên",
+    "bạn khỏe không",
+    "tôi yêu gia đình tôi",
+    "hôm nay trời đẹp",
+    "cảm ơn bạn rất nhiều",
+    "tôi muốn uống nước",
+    "bạn tên là gì",
+    "tôi đi học",
+    "mẹ tôi là giáo viên",
+    "tôi không hiểu",
+    "xin lỗi tôi đến muộn",
+    "bạn bao nhiêu tuổi",
+    "tôi thích ăn phở",
+    "hẹn gặp lại bạn",
+    "tôi sống ở hà nội",
+]
+
+
+def model_size_mb(paraphraser: Paraphraser) -> float:
+    state = paraphraser.model.state_dict()
+    return sum(t.numel() * t.element_size() for t in state.values() if hasattr(t, "numel")) / (1024 * 1024)
+
+
+def run(paraphraser: Paraphraser, batch_size: int):
+    single_start = perf_counter()
+    outputs = [paraphraser.paraphrase(phrase) for phrase in PHRASES]
+    single_seconds = perf_counter() - single_start
+
+    batch_start = perf_counter()
+    batched = []
+    for start in range(0, len(PHRASES), batch_size):
+        batched.extend(paraphraser.paraphrase_batch(PHRASES[start:start + batch_size]))
+    batch_seconds = perf_counter() - batch_start
+
+    return outputs, batched, single_seconds, batch_seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-match", type=float, default=1.0, help="minimum share of identical outputs")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    reference = Paraphraser(quantize=False)
+    quantized = Paraphraser(quantize=True)
+
+    ref_outputs, ref_batched, ref_single_s, ref_batch_s = run(reference, args.batch_size)
+    q_outputs, q_batched, q_single_s, q_batch_s = run(quantized, args.batch_size)
+
+    print(f"{'variant':<8} {'size MB':>8} {'single ms/phrase':>17} {'batched ms/phrase':>18}")
+    for name, paraphraser, single_s, batch_s in (
+        ("fp32", reference, ref_single_s, ref_batch_s),
+        ("int8", quantized, q_single_s, q_batch_s),
+    ):
+        print(f"{name:<8} {model_size_mb(paraphraser):>8.1f} {1000 * single_s / len(PHRASES):>17.1f} {1000 * batch_s / len(PHRASES):>18.1f}")
+
+    batch_mismatches = [p for p, a, b in zip(PHRASES, ref_outputs, ref_batched) if a != b]
+    if batch_mismatches:
+        print(f"\nfp32 batched output differs from single output for: {batch_mismatches}")
+
+    matches = 0
+    print()
+    for phrase, expected, actual in zip(PHRASES, ref_outputs, q_outputs):
+        if expected == actual:
+            matches += 1
+        else:
+            print(f"MISMATCH {phrase!r}: fp32={expected!r} int8={actual!r}")
+
+    match_rate = matches / len(PHRASES)
+    print(f"\nint8 matches fp32 on {matches}/{len(PHRASES)} phrases ({match_rate:.0%})")
+    return 0 if match_rate >= args.min_match else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
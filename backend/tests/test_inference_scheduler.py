@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from app.services.inference_scheduler import InferenceScheduler
+
+
+class BlockingDetector:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def detect_batch(self, frames, batch_size=8, input_size=640, conf_threshold=None):
+        self.calls += 1
+        if self.calls == 1:
+            self.release.wait(timeout=5)
+        return [[{"value": int(frame[0, 0, 0])}] for frame in frames]
+
+
+class ManualWorkerPool:
+    def __init__(self):
+        self.futures = []
+
+    def submit_batch(self, frames, input_size=640, conf_threshold=None, model=None):
+        future = Future()
+        self.futures.append((future, [[{"value": int(frame[0, 0, 0])}] for frame in frames]))
+        return future
+
+
+def make_frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_cancelled_caller_does_not_stop_the_scheduler():
+    detector = BlockingDetector()
+    scheduler = InferenceScheduler(detector=detector, max_batch_size=4, max_wait_ms=20)
+    try:
+        first = scheduler.submit(make_frame(1))
+        while detector.calls == 0:
+            threading.Event().wait(0.01)
+
+        cancelled = scheduler.submit(make_frame(2))
+        waiting = scheduler.submit(make_frame(3))
+        assert cancelled.cancel()
+        detector.release.set()
+
+        assert first.result(timeout=5) == [{"value": 1}]
+        assert waiting.result(timeout=5) == [{"value": 3}]
+        assert scheduler.submit(make_frame(4)).result(timeout=5) == [{"value": 4}]
+    finally:
+        scheduler.stop()
+
+
+def test_cancelled_caller_does_not_block_the_rest_of_a_pool_batch():
+    pool = ManualWorkerPool()
+    scheduler = InferenceScheduler(worker_pool=pool, max_batch_size=2, max_wait_ms=1000)
+    try:
+        futures = [scheduler.submit(make_frame(1)), scheduler.submit(make_frame(2))]
+        while not pool.futures:
+            threading.Event().wait(0.01)
+
+        futures[0].cancel()
+        batch_future, results = pool.futures[0]
+        batch_future.set_result(results)
+
+        assert futures[1].result(timeout=5) == [{"value": 2}]
+        later = scheduler.submit(make_frame(3))
+        while len(pool.futures) < 2:
+            threading.Event().wait(0.01)
+        batch_future, results = pool.futures[1]
+        batch_future.set_result(results)
+        assert later.result(timeout=5) == [{"value": 3}]
+    finally:
+        scheduler.stop()
@@ -90,7 +90,6 @@ class WebSocketClient {
         timestamp?: number,
         returnImage: boolean = false,
         skipFrames: number = 0,
-        resizeFactor: number = 1.0,
         inputSize: number = 320
     ): void {
         if (this.socket && this.isConnected) {
@@ -99,7 +98,6 @@ class WebSocketClient {
                 timestamp: timestamp || Date.now(),
                 return_image: returnImage,
                 skip_frames: skipFrames,
-                resize_factor: resizeFactor,
                 input_size: inputSize
             });
             this.socket.send(message);
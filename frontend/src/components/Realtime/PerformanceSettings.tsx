@@ -3,8 +3,6 @@ import React from "react";
 interface PerformanceSettingsProps {
     skipFrames: number;
     setSkipFrames: (value: number) => void;
-    resizeFactor: number;
-    setResizeFactor: (value: number) => void;
     returnImage: boolean;
     setReturnImage: (value: boolean) => void;
     isStreaming: boolean;
@@ -13,8 +11,6 @@ interface PerformanceSettingsProps {
 const PerformanceSettings: React.FC<PerformanceSettingsProps> = ({
     skipFrames,
     setSkipFrames,
-    resizeFactor,
-    setResizeFactor,
     returnImage,
     setReturnImage,
     isStreaming
@@ -43,25 +39,6 @@ const PerformanceSettings: React.FC<PerformanceSettingsProps> = ({
                         />
                     </div>
 
-                    <div className="flex justify-between items-center">
-                        <label htmlFor="resizeFactor" className="text-sm" title="Resize the image before processing. Smaller values mean faster processing but may reduce accuracy for small objects.">
-                            Resize Factor: {resizeFactor.toFixed(1)}x
-                            <span className="ml-1 text-xs text-blue-500 cursor-pointer" title="Resize the image before processing. Smaller values mean faster processing but may reduce accuracy for small objects.">ⓘ</span>
-                        </label>
-                        <input
-                            id="resizeFactor"
-                            type="range"
-                            min="0.2"
-                            max="1.0"
-                            step="0.1"
-                            value={resizeFactor}
-                            onChange={(e) => setResizeFactor(parseFloat(e.target.value))}
-                            className="w-1/2"
-                            disabled={isStreaming}
-                            title="Lower values reduce image size, improving performance but may reduce detection accuracy"
-                        />
-                    </div>
-
                     {/* <div className="flex justify-between items-center">
                         <label htmlFor="inputSize" className="text-sm" title="The input resolution for the YOLO model. Smaller sizes are faster, larger sizes are more accurate.">
                             Input Size: {inputSize}px
@@ -22,7 +22,6 @@ const Realtime: React.FC<RealtimeProps> = ({ isActive = true }) => {
   const [returnImage, setReturnImage] = useState(false);
   const [frameRate] = useState(10);
   const [skipFrames, setSkipFrames] = useState(0);
-  const [resizeFactor, setResizeFactor] = useState(1.0);
   const [inputSize] = useState(320);
 
   const frameInterval = useRef<NodeJS.Timeout | null>(null);
@@ -45,14 +44,13 @@ const Realtime: React.FC<RealtimeProps> = ({ isActive = true }) => {
     if (isStreaming) {
       const frameData = captureFrame(videoRef, canvasRef);
       if (frameData) {
-        sendFrame(frameData, returnImage, skipFrames, resizeFactor, inputSize);
+        sendFrame(frameData, returnImage, skipFrames, inputSize);
       }
     }
   }, [
     isStreaming,
     returnImage,
     skipFrames,
-    resizeFactor,
     inputSize,
     captureFrame,
     sendFrame,
@@ -178,8 +176,6 @@ const Realtime: React.FC<RealtimeProps> = ({ isActive = true }) => {
                 <PerformanceSettings
                   skipFrames={skipFrames}
                   setSkipFrames={setSkipFrames}
-                  resizeFactor={resizeFactor}
-                  setResizeFactor={setResizeFactor}
                   returnImage={returnImage}
                   setReturnImage={setReturnImage}
                   isStreaming={isStreaming}
@@ -76,7 +76,6 @@ export const useRealtimeDetection = ({ onError }: UseRealtimeDetectionProps) =>
         frameData: string,
         returnImage: boolean,
         skipFrames: number,
-        resizeFactor: number,
         inputSize: number
     ) => {
         websocketClient.sendFrame(
@@ -84,7 +83,6 @@ export const useRealtimeDetection = ({ onError }: UseRealtimeDetectionProps) =>
             Date.now(),
             returnImage,
             skipFrames,
-            resizeFactor,
             inputSize
         );
     }, []);